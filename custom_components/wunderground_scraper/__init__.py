@@ -2,12 +2,45 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN
+from homeassistant.helpers import config_validation as cv, instance_id
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .archive import ArchiveWriter
+from .cache import async_get_observation_cache
+from .const import (
+    ARCHIVE_DIR,
+    CONF_ARCHIVE,
+    CONF_COORDINATION,
+    CONF_COORDINATION_TARGET,
+    CONF_PUBLISH_TARGET,
+    CONF_PUBLISH_TOPIC,
+    CONF_WEBHOOK_URL,
+    COORDINATION_NONE,
+    DATA_STARTUP_SLOT,
+    DEFAULT_PUBLISH_TOPIC,
+    DOMAIN,
+    PROBE_CACHE_TTL,
+    PUBLISH_TARGET_NONE,
+    STARTUP_STAGGER,
+    STARTUP_STAGGER_SLOTS,
+    STORAGE_VERSION,
+)
 from .coordinator import WundergroundDataUpdateCoordinator
+from .leader import async_get_leader_election
+from .publisher import async_get_publisher
+from .services import async_setup_services
 
 PLATFORMS = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the Wunderground Scraper services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Wunderground Scraper from a config entry."""
@@ -16,12 +49,67 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Get URL - prefer options over data
     url = entry.options.get("url") or entry.data.get("url")
 
+    # Optional republishing of observations, one publisher per destination
+    # shared by every entry so observations from several stations are batched
+    publisher = None
+    target = entry.options.get(CONF_PUBLISH_TARGET, PUBLISH_TARGET_NONE)
+    if target != PUBLISH_TARGET_NONE:
+        publisher = async_get_publisher(
+            hass,
+            target,
+            topic_prefix=entry.options.get(CONF_PUBLISH_TOPIC, DEFAULT_PUBLISH_TOPIC),
+            webhook_url=entry.options.get(CONF_WEBHOOK_URL),
+        )
+        publisher.async_start()
+        entry.async_on_unload(publisher.async_stop)
+
+    # Optional local archive of raw observations
+    archive = None
+    if entry.options.get(CONF_ARCHIVE, False):
+        archive = ArchiveWriter(hass.config.path(ARCHIVE_DIR))
+
+    # Optional lease shared with other HA instances polling the same stations
+    election = None
+    mode = entry.options.get(CONF_COORDINATION, COORDINATION_NONE)
+    if mode != COORDINATION_NONE:
+        election = async_get_leader_election(
+            hass,
+            mode,
+            entry.options.get(CONF_COORDINATION_TARGET),
+            await instance_id.async_get(hass),
+        )
+        await election.async_start()
+        entry.async_on_unload(election.async_stop)
+
     coordinator = WundergroundDataUpdateCoordinator(
         hass=hass,
         url=url,
+        publisher=publisher,
+        archive=archive,
+        store=_async_get_store(hass, entry),
+        election=election,
     )
-
-    await coordinator.async_config_entry_first_refresh()
+    if election is not None:
+        entry.async_on_unload(election.async_add_listener(coordinator.async_on_leadership))
+
+    # Always restore first so persisted precipitation accounting is kept
+    restored = await coordinator.async_restore_data()
+
+    # An entry just created (or reconfigured) by a flow reuses the flow's probe
+    probe = async_get_observation_cache(hass).get(coordinator.station_id, PROBE_CACHE_TTL)
+    if probe is not None:
+        coordinator.async_seed(probe["observation"], probe["fetched"])
+    elif restored:
+        # Entities are created from the restored state and the first fetch
+        # happens in the background, spread out across entries at startup
+        async def _async_first_refresh(_now):
+            await coordinator.async_refresh()
+
+        entry.async_on_unload(
+            async_call_later(hass, _startup_delay(hass), _async_first_refresh)
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -33,6 +121,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def _async_get_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store holding an entry's last observation."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+
+
+def _startup_delay(hass: HomeAssistant) -> float:
+    """Return how long to wait before an entry's first refresh."""
+    if hass.is_running:
+        # Reloads and newly added entries refresh right away
+        return 0
+    slot = hass.data.get(DATA_STARTUP_SLOT, 0)
+    hass.data[DATA_STARTUP_SLOT] = slot + 1
+    return (slot % STARTUP_STAGGER_SLOTS) * STARTUP_STAGGER
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry when options change."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -44,4 +147,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
 
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove an entry's persisted observation."""
+    await _async_get_store(hass, entry).async_remove()
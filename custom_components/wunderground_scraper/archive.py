@@ -0,0 +1,346 @@
+"""Columnar on-disk archive of raw station observations.
+
+Each station gets one directory per UTC day, and each day holds one file per
+column: ``epoch.i64`` with the observation times and ``<field>.f64`` with the
+values, all fixed-width in native byte order so row ``n`` lives at byte
+``n * 8`` of every column. Missing values are stored as NaN. Appends only ever
+add rows with a newer epoch, so every segment is sorted by time and can be
+range-scanned with a binary search on its memory-mapped epoch column.
+
+The reader has no Home Assistant dependencies so the archive can also be used
+directly from notebooks or training scripts.
+"""
+import csv
+import logging
+import math
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
+
+_LOGGER = logging.getLogger(__name__)
+
+# Raw observation fields, in column order. Celsius values are derived from
+# the Fahrenheit ones and are not stored.
+ARCHIVE_FIELDS = [
+    "temperature",
+    "feels_like",
+    "dew_point",
+    "humidity",
+    "pressure",
+    "wind_speed",
+    "wind_gust",
+    "wind_direction",
+    "precipitation_rate",
+    "precipitation_accumulation",
+    "solar_radiation",
+    "uv_index",
+]
+
+EPOCH_COLUMN = "epoch.i64"
+FIELD_SUFFIX = ".f64"
+ROW_SIZE = 8
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_PARQUET = "parquet"
+EXPORT_FORMATS = [EXPORT_FORMAT_CSV, EXPORT_FORMAT_PARQUET]
+
+# Downsampled buckets per Parquet row group
+EXPORT_BATCH_BUCKETS = 10000
+
+
+def _day_partition(epoch):
+    """Return the day directory name for an epoch."""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d")
+
+
+class ArchiveWriter:
+    """Append observations to per-day columnar segments."""
+
+    def __init__(self, base_path):
+        """Initialize."""
+        self.base_path = base_path
+
+    def append(self, station_id, epoch, data):
+        """Append one observation, skipping it if it is not newer than the last row.
+
+        Returns True if a row was written. This does blocking I/O and must
+        run in an executor.
+        """
+        segment = os.path.join(self.base_path, station_id, _day_partition(epoch))
+        os.makedirs(segment, exist_ok=True)
+
+        epoch_path = os.path.join(segment, EPOCH_COLUMN)
+        rows = self._align(segment, epoch_path)
+        last_epoch = self._last_epoch(epoch_path, rows)
+        if last_epoch is not None and epoch <= last_epoch:
+            return False
+
+        # Write the value columns first so the epoch column, which defines
+        # the row count readers see, never gets ahead of them.
+        for field in ARCHIVE_FIELDS:
+            value = data.get(field)
+            try:
+                value = float(value) if value is not None else math.nan
+            except (TypeError, ValueError):
+                value = math.nan
+            with open(os.path.join(segment, field + FIELD_SUFFIX), "ab") as column:
+                array("d", [value]).tofile(column)
+
+        with open(epoch_path, "ab") as column:
+            array("q", [int(epoch)]).tofile(column)
+        return True
+
+    @staticmethod
+    def _align(segment, epoch_path):
+        """Cut every column back to the complete rows and return their count.
+
+        A crash mid-append leaves value columns (and possibly part of the
+        epoch column) one row ahead. Appending after that orphaned data would
+        shift every later row of those columns against the epochs, so it is
+        dropped first. Value columns that are short are padded with NaN.
+        """
+        size = _file_size(epoch_path)
+        rows = size // ROW_SIZE
+        if size % ROW_SIZE:
+            os.truncate(epoch_path, rows * ROW_SIZE)
+
+        for field in ARCHIVE_FIELDS:
+            path = os.path.join(segment, field + FIELD_SUFFIX)
+            size = _file_size(path)
+            if size > rows * ROW_SIZE:
+                os.truncate(path, rows * ROW_SIZE)
+            elif size < rows * ROW_SIZE:
+                with open(path, "ab") as column:
+                    column.truncate(size - size % ROW_SIZE)
+                    array("d", [math.nan] * (rows - size // ROW_SIZE)).tofile(column)
+        return rows
+
+    @staticmethod
+    def _last_epoch(epoch_path, rows):
+        """Return the newest epoch in a segment, or None if it is empty."""
+        if not rows:
+            return None
+        with open(epoch_path, "rb") as column:
+            column.seek((rows - 1) * ROW_SIZE)
+            return struct.unpack("=q", column.read(ROW_SIZE))[0]
+
+
+class ArchiveReader:
+    """Range scans over the archive using memory-mapped segments."""
+
+    def __init__(self, base_path):
+        """Initialize."""
+        self.base_path = base_path
+
+    def stations(self):
+        """Return the station IDs that have archived data."""
+        try:
+            return sorted(
+                entry.name for entry in os.scandir(self.base_path) if entry.is_dir()
+            )
+        except FileNotFoundError:
+            return []
+
+    def days(self, station_id):
+        """Return the day partitions archived for a station, oldest first."""
+        try:
+            return sorted(
+                entry.name
+                for entry in os.scandir(os.path.join(self.base_path, station_id))
+                if entry.is_dir()
+            )
+        except FileNotFoundError:
+            return []
+
+    def scan(self, station_id, start, end, fields=None):
+        """Yield ``(epochs, columns)`` for each segment overlapping [start, end).
+
+        ``epochs`` is a memoryview of int64 epochs and ``columns`` maps each
+        field to a memoryview of float64 values, all sliced to the requested
+        range and backed directly by the mapped files. The views are released
+        when the generator advances, so copy anything that must outlive the
+        current iteration.
+        """
+        fields = list(fields or ARCHIVE_FIELDS)
+        first_day = _day_partition(start)
+        last_day = _day_partition(end)
+
+        for day in self.days(station_id):
+            if day < first_day or day > last_day:
+                continue
+            segment = os.path.join(self.base_path, station_id, day)
+            with self._map_segment(segment, fields) as (epochs, columns):
+                lo = bisect_left(epochs, start)
+                hi = bisect_left(epochs, end)
+                if lo == hi:
+                    continue
+                window = {field: view[lo:hi] for field, view in columns.items()}
+                epoch_window = epochs[lo:hi]
+                try:
+                    yield epoch_window, window
+                finally:
+                    epoch_window.release()
+                    for view in window.values():
+                        view.release()
+
+    def downsample(self, station_id, start, end, interval, fields=None):
+        """Yield ``(bucket_start, {field: mean})`` in buckets of ``interval`` seconds.
+
+        NaN values are ignored; a field with no values in a bucket is None.
+        """
+        fields = list(fields or ARCHIVE_FIELDS)
+        bucket = None
+        sums = counts = None
+
+        for epochs, columns in self.scan(station_id, start, end, fields):
+            for row, epoch in enumerate(epochs):
+                row_bucket = epoch - epoch % interval
+                if row_bucket != bucket:
+                    if bucket is not None:
+                        yield bucket, _means(fields, sums, counts)
+                    bucket = row_bucket
+                    sums = dict.fromkeys(fields, 0.0)
+                    counts = dict.fromkeys(fields, 0)
+                for field in fields:
+                    value = columns[field][row]
+                    if not math.isnan(value):
+                        sums[field] += value
+                        counts[field] += 1
+
+        if bucket is not None:
+            yield bucket, _means(fields, sums, counts)
+
+    def export(self, station_id, start, end, path, fmt=EXPORT_FORMAT_CSV, fields=None, interval=None):
+        """Stream a time range to a CSV or Parquet file and return the row count.
+
+        Only one segment is mapped at a time, so memory use does not grow
+        with the size of the range. Parquet output requires ``pyarrow``.
+        """
+        fields = list(fields or ARCHIVE_FIELDS)
+        if fmt == EXPORT_FORMAT_PARQUET:
+            return self._export_parquet(station_id, start, end, path, fields, interval)
+        return self._export_csv(station_id, start, end, path, fields, interval)
+
+    def _export_csv(self, station_id, start, end, path, fields, interval):
+        """Write rows as CSV, leaving missing values empty."""
+        rows = 0
+        with open(path, "w", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(["epoch", *fields])
+            if interval:
+                for bucket, means in self.downsample(station_id, start, end, interval, fields):
+                    writer.writerow([bucket, *("" if means[f] is None else means[f] for f in fields)])
+                    rows += 1
+                return rows
+
+            for epochs, columns in self.scan(station_id, start, end, fields):
+                for row, epoch in enumerate(epochs):
+                    values = (columns[field][row] for field in fields)
+                    writer.writerow([epoch, *("" if math.isnan(v) else v for v in values)])
+                rows += len(epochs)
+        return rows
+
+    def _export_parquet(self, station_id, start, end, path, fields, interval):
+        """Write one Parquet row group per segment (or per batch of buckets)."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet export requires the pyarrow package") from e
+
+        schema = pa.schema(
+            [("epoch", pa.int64())] + [(field, pa.float64()) for field in fields]
+        )
+        rows = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            if interval:
+                buckets = self.downsample(station_id, start, end, interval, fields)
+                while batch := list(islice(buckets, EXPORT_BATCH_BUCKETS)):
+                    table = pa.table(
+                        {
+                            "epoch": [bucket for bucket, _ in batch],
+                            **{f: [means[f] for _, means in batch] for f in fields},
+                        },
+                        schema=schema,
+                    )
+                    writer.write_table(table)
+                    rows += len(batch)
+                return rows
+
+            for epochs, columns in self.scan(station_id, start, end, fields):
+                count = len(epochs)
+                # Copy out of the mapped segment: pyarrow must not keep buffer
+                # exports on the views, which are released when the scan
+                # advances. NaN marks missing values.
+                arrays = [
+                    pa.Array.from_buffers(pa.int64(), count, [None, pa.py_buffer(epochs.tobytes())])
+                ]
+                arrays += [
+                    pa.Array.from_buffers(
+                        pa.float64(), count, [None, pa.py_buffer(columns[f].tobytes())]
+                    )
+                    for f in fields
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows += count
+        return rows
+
+    @staticmethod
+    @contextmanager
+    def _map_segment(segment, fields):
+        """Memory-map a segment's columns, truncated to the rows all columns share."""
+        maps = {}
+        try:
+            for name in [EPOCH_COLUMN] + [field + FIELD_SUFFIX for field in fields]:
+                path = os.path.join(segment, name)
+                if os.path.exists(path) and os.path.getsize(path) >= ROW_SIZE:
+                    with open(path, "rb") as column:
+                        maps[name] = mmap.mmap(column.fileno(), 0, access=mmap.ACCESS_READ)
+
+            # An append in progress (or a crash the writer has not yet
+            # repaired) can leave value columns one row ahead of the epoch
+            # column; only expose complete rows.
+            rows = min(len(m) // ROW_SIZE for m in maps.values()) if EPOCH_COLUMN in maps else 0
+
+            epochs = _column_view(maps.get(EPOCH_COLUMN), "q", rows)
+            columns = {
+                field: _column_view(maps.get(field + FIELD_SUFFIX), "d", rows)
+                for field in fields
+            }
+            try:
+                yield epochs, columns
+            finally:
+                epochs.release()
+                for view in columns.values():
+                    view.release()
+        finally:
+            for mapped in maps.values():
+                mapped.close()
+
+
+def _file_size(path):
+    """Return a file's size, or 0 if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _column_view(mapped, typecode, rows):
+    """Return a typed view over the first ``rows`` values of a mapped column.
+
+    Fields that were never written in a segment read as NaN.
+    """
+    if mapped is None:
+        return memoryview(array(typecode, [math.nan] * rows if typecode == "d" else []))
+    return memoryview(mapped)[: rows * ROW_SIZE].cast(typecode)
+
+
+def _means(fields, sums, counts):
+    """Return per-field means for a bucket."""
+    return {f: (sums[f] / counts[f] if counts[f] else None) for f in fields}
@@ -0,0 +1,69 @@
+"""Short-lived observation cache shared by the integration's services."""
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_OBSERVATION_CACHE, OBSERVATION_CACHE_TTL
+from .coordinator import async_fetch_observation, parse_observation
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ObservationCache:
+    """Cache parsed observations for stations fetched on demand.
+
+    Concurrent fetches of the same station are coalesced into one request.
+    Entries are dicts with ``data``, ``epoch``, ``fetched`` (a UTC datetime)
+    and the raw ``observation``.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize."""
+        self.hass = hass
+        self._entries = {}
+        self._pending = {}
+
+    def get(self, station_id, max_age=OBSERVATION_CACHE_TTL):
+        """Return a cached entry no older than max_age seconds, or None."""
+        entry = self._entries.get(station_id)
+        if entry is None:
+            return None
+        if (dt_util.utcnow() - entry["fetched"]).total_seconds() > max_age:
+            return None
+        return entry
+
+    async def async_fetch(self, station_id):
+        """Fetch a station, joining a request that is already in flight."""
+        task = self._pending.get(station_id)
+        if task is None:
+            task = self.hass.async_create_task(self._async_fetch(station_id))
+            self._pending[station_id] = task
+            task.add_done_callback(lambda _: self._pending.pop(station_id, None))
+        # Shielded so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, station_id):
+        """Fetch, parse and store one station's observation."""
+        obs = await async_fetch_observation(self.hass, station_id)
+        entry = {
+            "data": parse_observation(obs),
+            "epoch": obs.get("epoch"),
+            "fetched": dt_util.utcnow(),
+            "observation": obs,
+        }
+        self._entries[station_id] = entry
+        return entry
+
+    def clear(self):
+        """Drop all cached observations."""
+        self._entries.clear()
+
+
+def async_get_observation_cache(hass: HomeAssistant) -> ObservationCache:
+    """Return the observation cache shared by all config entries."""
+    cache = hass.data.get(DATA_OBSERVATION_CACHE)
+    if cache is None:
+        cache = hass.data[DATA_OBSERVATION_CACHE] = ObservationCache(hass)
+    return cache
@@ -0,0 +1,152 @@
+"""Domain-wide circuit breaker for the Weather.com PWS API."""
+import logging
+import random
+import time
+from collections import deque
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    BREAKER_ERROR_THRESHOLD,
+    BREAKER_MAX_COOLDOWN,
+    BREAKER_MIN_REQUESTS,
+    BREAKER_OPEN_COOLDOWN,
+    BREAKER_PROBE_TIMEOUT,
+    BREAKER_WINDOW,
+    DATA_CIRCUIT_BREAKER,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Ticket for requests admitted while the circuit is closed; probes get their own
+REQUEST = 0
+
+
+class CircuitBreaker:
+    """Track upstream health and short-circuit requests during outages.
+
+    Outcomes are kept in a rolling time window. When the error rate in that
+    window crosses the threshold the breaker opens and every coordinator
+    stops hitting the API. After a jittered cooldown a single caller is let
+    through as a probe (half-open); its result either closes the breaker or
+    re-opens it with a longer cooldown.
+    """
+
+    def __init__(
+        self,
+        window=BREAKER_WINDOW,
+        error_threshold=BREAKER_ERROR_THRESHOLD,
+        min_requests=BREAKER_MIN_REQUESTS,
+        cooldown=BREAKER_OPEN_COOLDOWN,
+        max_cooldown=BREAKER_MAX_COOLDOWN,
+    ):
+        """Initialize."""
+        self._window = window
+        self._error_threshold = error_threshold
+        self._min_requests = min_requests
+        self._base_cooldown = cooldown
+        self._max_cooldown = max_cooldown
+
+        self._outcomes = deque()
+        self._state = STATE_CLOSED
+        self._cooldown = cooldown
+        self._retry_at = 0.0
+        # Ticket of the half-open probe in flight (None if there is none)
+        self._probe = None
+        self._probe_started = 0.0
+        self._next_probe = 1
+
+    @property
+    def state(self):
+        """Return the current breaker state."""
+        if self._state == STATE_OPEN and time.monotonic() >= self._retry_at:
+            return STATE_HALF_OPEN
+        return self._state
+
+    def allow_request(self):
+        """Return a ticket if the caller may hit the API now, else None.
+
+        The ticket is passed back to `record_success` or `record_failure`.
+        While half-open only one caller at a time is admitted as the probe;
+        everyone else keeps serving cached data until the probe reports back.
+        Only the probe's ticket can close or re-open the circuit, so requests
+        admitted before it tripped only count towards the error rate.
+        """
+        if self._state == STATE_CLOSED:
+            return REQUEST
+
+        now = time.monotonic()
+        if now < self._retry_at:
+            return None
+        # A probe whose caller was cancelled never reports back; don't let
+        # it hold the breaker half-open forever.
+        if self._probe is not None and now - self._probe_started < BREAKER_PROBE_TIMEOUT:
+            return None
+
+        self._state = STATE_HALF_OPEN
+        self._probe = self._next_probe
+        self._next_probe += 1
+        self._probe_started = now
+        _LOGGER.debug("Circuit half-open, sending probe request to Weather.com")
+        return self._probe
+
+    def record_success(self, ticket=REQUEST):
+        """Record a successful upstream call; return True if it closed the circuit."""
+        self._record(True)
+        if ticket == REQUEST or ticket != self._probe:
+            return False
+        _LOGGER.info("Weather.com API recovered, closing circuit breaker")
+        self._probe = None
+        self._state = STATE_CLOSED
+        self._cooldown = self._base_cooldown
+        self._outcomes.clear()
+        return True
+
+    def record_failure(self, ticket=REQUEST):
+        """Record a failed upstream call."""
+        self._record(False)
+
+        if ticket != REQUEST and ticket == self._probe:
+            # Probe failed, back off further before the next one
+            self._probe = None
+            self._cooldown = min(self._cooldown * 2, self._max_cooldown)
+            self._open()
+        elif self._state == STATE_CLOSED and self._should_trip():
+            self._open()
+
+    def _record(self, success):
+        """Append an outcome and drop the ones outside the window."""
+        now = time.monotonic()
+        self._outcomes.append((now, success))
+        while self._outcomes and self._outcomes[0][0] < now - self._window:
+            self._outcomes.popleft()
+
+    def _should_trip(self):
+        """Return True if the rolling error rate warrants opening."""
+        total = len(self._outcomes)
+        if total < self._min_requests:
+            return False
+        failures = sum(1 for _, success in self._outcomes if not success)
+        return failures / total >= self._error_threshold
+
+    def _open(self):
+        """Open the circuit and schedule the next probe."""
+        # Jitter keeps HA instances sharing an upstream from probing in lockstep
+        delay = self._cooldown * random.uniform(0.8, 1.2)
+        self._state = STATE_OPEN
+        self._retry_at = time.monotonic() + delay
+        _LOGGER.warning(
+            f"Weather.com API appears to be down, pausing requests for {delay:.0f}s"
+        )
+
+
+def async_get_circuit_breaker(hass: HomeAssistant) -> CircuitBreaker:
+    """Return the circuit breaker shared by all config entries."""
+    breaker = hass.data.get(DATA_CIRCUIT_BREAKER)
+    if breaker is None:
+        breaker = hass.data[DATA_CIRCUIT_BREAKER] = CircuitBreaker()
+    return breaker
@@ -1,9 +1,95 @@
 """Config flow for Wunderground Scraper."""
+import asyncio
+import logging
+import os
+
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .cache import async_get_observation_cache
+from .const import (
+    CONF_ARCHIVE,
+    CONF_COORDINATION,
+    CONF_COORDINATION_TARGET,
+    CONF_PUBLISH_TARGET,
+    CONF_PUBLISH_TOPIC,
+    CONF_SENSORS,
+    CONF_WEBHOOK_URL,
+    COORDINATION_FILE,
+    COORDINATION_MODES,
+    COORDINATION_NONE,
+    COORDINATION_REDIS,
+    DEFAULT_PUBLISH_TOPIC,
+    DOMAIN,
+    PROBE_CACHE_TTL,
+    PROBE_TIMEOUT,
+    PUBLISH_TARGET_NONE,
+    PUBLISH_TARGET_WEBHOOK,
+    PUBLISH_TARGETS,
+)
+from .coordinator import StationNotReporting, extract_station_id
+from .sensor import SENSOR_TYPES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StationProbeError(Exception):
+    """Error to indicate the station could not be validated."""
+
+    def __init__(self, reason):
+        """Initialize with the translation key of the form error."""
+        super().__init__(reason)
+        self.reason = reason
+
+
+async def async_probe_station(hass: HomeAssistant, url):
+    """Resolve a station URL or ID and fetch its current observation.
+
+    Returns the station ID and the observation cache entry. A recent probe of
+    the same station is reused, and a successful probe stays cached long
+    enough to seed the new entry's first refresh.
+    """
+    station_id = extract_station_id(url.strip())
+    if not station_id:
+        raise StationProbeError("invalid_station")
+
+    cache = async_get_observation_cache(hass)
+    probe = cache.get(station_id, PROBE_CACHE_TTL)
+    if probe is not None:
+        return station_id, probe
+
+    try:
+        async with asyncio.timeout(PROBE_TIMEOUT):
+            return station_id, await cache.async_fetch(station_id)
+    except StationNotReporting as e:
+        raise StationProbeError("station_offline") from e
+    except (TimeoutError, UpdateFailed) as e:
+        raise StationProbeError("cannot_connect") from e
+    except Exception as e:
+        _LOGGER.exception(f"Unexpected error probing station {station_id}")
+        raise StationProbeError("unknown") from e
+
+
+def _describe_sensors(data):
+    """Return a readable list of the sensors a station reports."""
+    return ", ".join(
+        info["name"] for key, info in SENSOR_TYPES.items()
+        if info.get("source", key) in data
+    ) or "none"
 
-from .const import DOMAIN
+
+def _validate_coordination(user_input):
+    """Return the form error for the coordination options, or None."""
+    mode = user_input.get(CONF_COORDINATION, COORDINATION_NONE)
+    target = user_input.get(CONF_COORDINATION_TARGET, "")
+    if mode == COORDINATION_FILE and not os.path.isabs(target):
+        return "coordination_path_invalid"
+    if mode == COORDINATION_REDIS and not target.startswith(("redis://", "rediss://", "unix://")):
+        return "coordination_url_invalid"
+    return None
 
 
 @config_entries.HANDLERS.register(DOMAIN)
@@ -12,15 +98,43 @@ class WundergroundScraperConfigFlow(config_entries.ConfigFlow):
 
     VERSION = 1
 
+    def __init__(self):
+        """Initialize the config flow."""
+        self._url = None
+        self._station_id = None
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
         if user_input is not None:
-            # Accept the URL/station ID without validation here
-            # The coordinator will validate when it initializes
-            await self.async_set_unique_id(user_input["url"])
-            self._abort_if_unique_id_configured()
-            return self.async_create_entry(title="Wunderground Scraper", data=user_input)
+            # Key the entry on the station, not the input, so the same station
+            # entered as an ID and as a URL is only added once
+            station_id = extract_station_id(user_input["url"].strip())
+            if station_id:
+                await self.async_set_unique_id(station_id)
+                self._abort_if_unique_id_configured()
+                # Older entries are keyed on the URL they were added with
+                for entry in self._async_current_entries(include_ignore=False):
+                    url = entry.options.get("url") or entry.data.get("url") or ""
+                    if extract_station_id(url.strip()) == station_id:
+                        return self.async_abort(reason="already_configured")
+
+            try:
+                self._station_id, probe = await async_probe_station(
+                    self.hass, user_input["url"]
+                )
+            except StationProbeError as e:
+                errors["url"] = e.reason
+            else:
+                self._url = user_input["url"]
+                return self.async_show_form(
+                    step_id="confirm",
+                    description_placeholders={
+                        "station_id": self._station_id,
+                        "location": probe["observation"].get("neighborhood") or "Unknown",
+                        "sensors": _describe_sensors(probe["data"]),
+                    },
+                )
 
         return self.async_show_form(
             step_id="user",
@@ -28,6 +142,10 @@ class WundergroundScraperConfigFlow(config_entries.ConfigFlow):
             errors=errors,
         )
 
+    async def async_step_confirm(self, user_input=None):
+        """Confirm adding the probed station."""
+        return self.async_create_entry(title="Wunderground Scraper", data={"url": self._url})
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -45,17 +163,71 @@ class WundergroundScraperOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Handle the initial step."""
-        if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
-
+        errors = {}
         # Get current URL from options or data
         current_url = self.config_entry.options.get("url", self.config_entry.data.get("url", ""))
 
+        if user_input is not None:
+            if (
+                user_input.get(CONF_PUBLISH_TARGET) == PUBLISH_TARGET_WEBHOOK
+                and not user_input.get(CONF_WEBHOOK_URL)
+            ):
+                errors[CONF_WEBHOOK_URL] = "webhook_url_required"
+            elif error := _validate_coordination(user_input):
+                errors[CONF_COORDINATION_TARGET] = error
+            elif user_input["url"].strip() == current_url.strip():
+                # Other options can be saved while the station or API is down
+                return self.async_create_entry(title="", data=user_input)
+            else:
+                try:
+                    await async_probe_station(self.hass, user_input["url"])
+                except StationProbeError as e:
+                    errors["url"] = e.reason
+                else:
+                    return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        sensors = _describe_sensors(coordinator.reported) if coordinator else "unknown"
+
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Required("url", default=current_url): str,
+                    vol.Optional(
+                        CONF_SENSORS,
+                        default=options.get(CONF_SENSORS, list(SENSOR_TYPES)),
+                    ): cv.multi_select(
+                        {key: info["name"] for key, info in SENSOR_TYPES.items()}
+                    ),
+                    vol.Optional(
+                        CONF_PUBLISH_TARGET,
+                        default=options.get(CONF_PUBLISH_TARGET, PUBLISH_TARGET_NONE),
+                    ): vol.In(PUBLISH_TARGETS),
+                    vol.Optional(
+                        CONF_PUBLISH_TOPIC,
+                        default=options.get(CONF_PUBLISH_TOPIC, DEFAULT_PUBLISH_TOPIC),
+                    ): str,
+                    vol.Optional(
+                        CONF_WEBHOOK_URL,
+                        default=options.get(CONF_WEBHOOK_URL, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_ARCHIVE,
+                        default=options.get(CONF_ARCHIVE, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_COORDINATION,
+                        default=options.get(CONF_COORDINATION, COORDINATION_NONE),
+                    ): vol.In(COORDINATION_MODES),
+                    vol.Optional(
+                        CONF_COORDINATION_TARGET,
+                        default=options.get(CONF_COORDINATION_TARGET, ""),
+                    ): str,
                 }
             ),
+            errors=errors,
+            description_placeholders={"sensors": sensors},
         )
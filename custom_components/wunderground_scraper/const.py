@@ -1,3 +1,80 @@
 """Constants for the Wunderground Scraper integration."""
 
 DOMAIN = "wunderground_scraper"
+
+DATA_CIRCUIT_BREAKER = f"{DOMAIN}_circuit_breaker"
+
+# Circuit breaker tuning (seconds unless noted)
+BREAKER_WINDOW = 900
+BREAKER_ERROR_THRESHOLD = 0.5  # fraction of failed requests in the window
+BREAKER_MIN_REQUESTS = 3
+BREAKER_OPEN_COOLDOWN = 60
+BREAKER_MAX_COOLDOWN = 600
+BREAKER_PROBE_TIMEOUT = 30
+BREAKER_RECOVERY_STAGGER = 1  # spacing of the refreshes sent once the circuit closes
+
+# How long last-known values are served while the API is unreachable
+STALE_DATA_TTL = 3600
+
+# Republishing observations to downstream consumers
+CONF_PUBLISH_TARGET = "publish_target"
+CONF_PUBLISH_TOPIC = "publish_topic_prefix"
+CONF_WEBHOOK_URL = "webhook_url"
+
+PUBLISH_TARGET_NONE = "none"
+PUBLISH_TARGET_MQTT = "mqtt"
+PUBLISH_TARGET_WEBHOOK = "webhook"
+PUBLISH_TARGETS = [PUBLISH_TARGET_NONE, PUBLISH_TARGET_MQTT, PUBLISH_TARGET_WEBHOOK]
+
+DEFAULT_PUBLISH_TOPIC = DOMAIN
+PUBLISH_BATCH_DELAY = 1
+PUBLISH_QUEUE_SIZE = 100
+PUBLISH_TIMEOUT = 10
+DATA_PUBLISHERS = f"{DOMAIN}_publishers"
+
+# Local observation archive
+CONF_ARCHIVE = "archive"
+ARCHIVE_DIR = "wunderground_scraper_archive"
+
+SERVICE_EXPORT_ARCHIVE = "export_archive"
+
+# Observation cache used by the services for stations without a config entry
+DATA_OBSERVATION_CACHE = f"{DOMAIN}_observation_cache"
+OBSERVATION_CACHE_TTL = 300
+REFRESH_MIN_INTERVAL = 60  # seconds between forced refreshes of one station
+
+# Station probe run by the config and options flows
+PROBE_TIMEOUT = 15
+PROBE_CACHE_TTL = 120  # probe results seed the new entry's first refresh
+
+SERVICE_REFRESH = "refresh"
+SERVICE_GET_OBSERVATION = "get_observation"
+SERVICE_CLEAR_CACHE = "clear_cache"
+
+# Last observation persisted per entry so setup does not wait on the network
+STORAGE_VERSION = 1
+STORE_SAVE_DELAY = 60
+
+# First refreshes after HA starts are spread out by this many seconds per entry
+DATA_STARTUP_SLOT = f"{DOMAIN}_startup_slot"
+STARTUP_STAGGER = 0.5
+STARTUP_STAGGER_SLOTS = 120
+
+# Sensors selected in the options; unselected fields are never parsed
+CONF_SENSORS = "sensors"
+
+# Optional leader election so several HA instances poll each station once
+CONF_COORDINATION = "coordination"
+CONF_COORDINATION_TARGET = "coordination_target"
+
+COORDINATION_NONE = "none"
+COORDINATION_FILE = "file"
+COORDINATION_REDIS = "redis"
+COORDINATION_MODES = [COORDINATION_NONE, COORDINATION_FILE, COORDINATION_REDIS]
+
+DATA_LEADER_ELECTIONS = f"{DOMAIN}_leader_elections"
+LEASE_TTL = 90  # well under the 5 minute poll interval
+LEASE_RENEW_INTERVAL = 30
+# Followers poll a station themselves once the leader's shared observation
+# is older than one poll interval plus this (seconds)
+SHARED_OBSERVATION_GRACE = 120
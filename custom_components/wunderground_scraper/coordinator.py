@@ -1,13 +1,23 @@
 """Data update coordinator for the Wunderground Scraper integration."""
 import logging
+import math
 import re
 from datetime import timedelta
 
-import requests
-
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .circuit_breaker import async_get_circuit_breaker
+from .const import (
+    BREAKER_RECOVERY_STAGGER,
+    DOMAIN,
+    SHARED_OBSERVATION_GRACE,
+    STALE_DATA_TTL,
+    STORE_SAVE_DELAY,
+)
+from .precipitation import PRECIPITATION_SENSORS, PrecipitationTracker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,13 +26,21 @@ API_KEY = "e1f10a1e78da46f5b10a1e78da96f525"
 API_ENDPOINT = "https://api.weather.com/v2/pws/observations/current"
 
 
+class WeatherComUnavailable(UpdateFailed):
+    """Error to indicate the Weather.com API itself is unreachable."""
+
+
+class StationNotReporting(UpdateFailed):
+    """Error to indicate the station has no current observation."""
+
+
 class WundergroundDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the Weather.com PWS API."""
 
-    def __init__(self, hass, url):
+    def __init__(self, hass, url, publisher=None, archive=None, store=None, election=None):
         """Initialize."""
         # Extract station ID from URL
-        self.station_id = self._extract_station_id(url)
+        self.station_id = extract_station_id(url)
         if not self.station_id:
             _LOGGER.error(
                 "Could not extract station ID from URL: %s. "
@@ -37,6 +55,37 @@ class WundergroundDataUpdateCoordinator(DataUpdateCoordinator):
             )
         
         _LOGGER.info(f"Initialized coordinator for station: {self.station_id}")
+
+        # When the last successful fetch happened and whether data is being
+        # served from that fetch because the API is unreachable
+        self.last_fetched = None
+        self.stale = False
+
+        # Optional fan-out of fresh observations to MQTT or a webhook
+        self.publisher = publisher
+        self.observation_epoch = None
+
+        # Optional append-only archive of raw observations
+        self.archive = archive
+
+        # Persisted last observation, restored at setup
+        self._store = store
+
+        # Monotonic precipitation counter and rain events, persisted with it
+        self.precipitation = PrecipitationTracker()
+
+        # Optional lease shared with other HA instances; only the leader
+        # fetches, followers read the leader's observations
+        self.election = election
+
+        # Sensor keys to parse; None parses everything. Narrowed by the
+        # sensor platform to the entities that are actually enabled.
+        self.fields = None
+
+        # Every sensor key the station has reported, kept (and persisted)
+        # apart from the narrowed data so deselected or disabled sensors can
+        # still be offered and re-created
+        self.reported = set()
         
         super().__init__(
             hass,
@@ -45,132 +94,386 @@ class WundergroundDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(minutes=5),
         )
 
-    def _extract_station_id(self, url):
-        """Extract station ID from Wunderground URL."""
-        # Match pattern like: /pws/STATIONID (dashboard URL)
-        match = re.search(r'/pws/([A-Z0-9]+)', url)
-        if match:
-            return match.group(1)
-        
-        # Match pattern like: /weather/us/ma/city/STATIONID (weather page URL)
-        match = re.search(r'/weather/[^/]+/[^/]+/[^/]+/([A-Z0-9]+)', url)
-        if match:
-            return match.group(1)
-        
-        # Match any URL ending with a station ID pattern
-        match = re.search(r'/([A-Z]{2,4}[A-Z0-9]+\d+)/?$', url)
-        if match:
-            return match.group(1)
-        
-        # If URL is just the station ID itself
-        if re.match(r'^[A-Z0-9]+$', url):
-            return url
-        
-        return None
+    async def async_restore_data(self):
+        """Restore the last persisted observation; return False if there is none.
 
-    def _fahrenheit_to_celsius(self, fahrenheit):
-        """Convert Fahrenheit to Celsius."""
-        if fahrenheit is None:
-            return None
-        
-        try:
-            celsius = (float(fahrenheit) - 32) * 5 / 9
-            return round(celsius, 1)
-        except (ValueError, TypeError):
-            _LOGGER.warning(f"Could not convert temperature '{fahrenheit}' to Celsius")
-            return None
+        Data younger than the stale TTL is restored as-is (flagged stale until
+        the next refresh). Older data only restores which sensors the station
+        reports, with unknown values, so entities can be created without
+        waiting on the network. Precipitation accounting is always restored.
+        """
+        if self._store is None:
+            return False
+
+        cached = await self._store.async_load()
+        if not cached or cached.get("station_id") not in (None, self.station_id):
+            # Nothing saved yet, or the entry was pointed at another station
+            return False
+
+        if cached.get("precipitation"):
+            self.precipitation = PrecipitationTracker(cached["precipitation"])
+        if not cached.get("data"):
+            return False
+        self.reported = set(cached.get("reported") or cached["data"])
+
+        last_fetched = dt_util.parse_datetime(cached.get("fetched") or "")
+        if last_fetched is not None and (
+            dt_util.utcnow() - last_fetched
+        ).total_seconds() < STALE_DATA_TTL:
+            self.data = cached["data"]
+            self.last_fetched = last_fetched
+            self.observation_epoch = cached.get("epoch")
+        else:
+            self.data = dict.fromkeys(cached["data"])
+        self.stale = True
+        return True
+
+    @callback
+    def async_set_fields(self, fields):
+        """Limit parsing to the given sensor keys.
+
+        The archive and the republisher consume whole observations, so while
+        either is enabled every field is still parsed.
+        """
+        if self.archive is not None or self.publisher is not None:
+            self.fields = None
+        else:
+            self.fields = frozenset(fields)
+        _LOGGER.debug(f"Parsing fields for {self.station_id}: {self.fields or 'all'}")
+
+    def _data_to_store(self):
+        """Return the data to persist."""
+        return {
+            "station_id": self.station_id,
+            "data": self.data,
+            "epoch": self.observation_epoch,
+            "fetched": self.last_fetched.isoformat() if self.last_fetched else None,
+            "precipitation": self.precipitation.as_dict(),
+            "reported": sorted(self.reported),
+        }
+
+    def _stale_data(self, reason):
+        """Return last-known data while it is within its TTL, else fail."""
+        if self.data is not None and self.last_fetched is not None:
+            age = (dt_util.utcnow() - self.last_fetched).total_seconds()
+            if age < STALE_DATA_TTL:
+                _LOGGER.debug(f"{reason}; serving {age:.0f}s old data for {self.station_id}")
+                self.stale = True
+                return self.data
+        raise UpdateFailed(reason)
+
+    @property
+    def is_leader(self):
+        """Return True if this instance polls Weather.com for the station."""
+        return self.election is None or self.election.is_leader
+
+    @callback
+    def async_on_leadership(self):
+        """Take over polling right away after winning the lease."""
+        self.hass.async_create_task(self.async_request_refresh())
 
     async def _async_update_data(self):
         """Update data via Weather.com PWS API."""
+        if not self.is_leader:
+            obs, fetched = await self._async_read_shared()
+            if obs is not None:
+                if self.last_fetched is not None and fetched <= self.last_fetched:
+                    # The leader has not polled since we last read
+                    return self.data
+                return self._process_observation(obs, fetched, shared=True)
+            # The leader isn't sharing this station (it may not have it
+            # configured, or has stopped polling it), so poll it ourselves
+
         try:
-            # Build API URL
-            params = {
-                'apiKey': API_KEY,
-                'stationId': self.station_id,
-                'format': 'json',
-                'units': 'e',  # Imperial units
-                'numericPrecision': 'decimal'
-            }
-            
-            # Make API request
-            response = await self.hass.async_add_executor_job(
-                lambda: requests.get(API_ENDPOINT, params=params, timeout=10)
+            obs = await async_fetch_observation(self.hass, self.station_id)
+        except WeatherComUnavailable as e:
+            return self._stale_data(str(e))
+
+        data = self._process_observation(obs)
+        if self.election is not None and self.is_leader:
+            self.hass.async_create_background_task(
+                self.election.async_write_observation(
+                    self.station_id,
+                    {"observation": obs, "fetched": self.last_fetched.isoformat()},
+                ),
+                f"{DOMAIN} share {self.station_id}",
             )
-            
-            if response.status_code == 204:
-                raise UpdateFailed(f"Station {self.station_id} is not reporting data (HTTP 204)")
-            
-            response.raise_for_status()
-            api_data = response.json()
-            
-            # Extract observation data
-            if not api_data.get('observations') or len(api_data['observations']) == 0:
-                raise UpdateFailed(f"No observations data returned for station {self.station_id}")
-            
-            obs = api_data['observations'][0]
-            imperial = obs.get('imperial', {})
-            
-            # Map API data to Home Assistant sensor format
-            data = {}
-            
-            # Temperature
-            if imperial.get('temp') is not None:
-                data['temperature'] = imperial['temp']
-                data['temperature_celsius'] = self._fahrenheit_to_celsius(imperial['temp'])
-            
-            # Feels like (use heat index or wind chill, whichever is available)
-            feels_like = imperial.get('heatIndex') or imperial.get('windChill')
-            if feels_like is not None:
-                data['feels_like'] = feels_like
-                data['feels_like_celsius'] = self._fahrenheit_to_celsius(feels_like)
-            
-            # Dew point
-            if imperial.get('dewpt') is not None:
-                data['dew_point'] = imperial['dewpt']
-                data['dew_point_celsius'] = self._fahrenheit_to_celsius(imperial['dewpt'])
-            
-            # Humidity
-            if obs.get('humidity') is not None:
-                data['humidity'] = obs['humidity']
-            
-            # Pressure
-            if imperial.get('pressure') is not None:
-                data['pressure'] = imperial['pressure']
-            
-            # Wind
-            if imperial.get('windSpeed') is not None:
-                data['wind_speed'] = imperial['windSpeed']
-            
-            if imperial.get('windGust') is not None:
-                data['wind_gust'] = imperial['windGust']
-            
-            if obs.get('winddir') is not None:
-                data['wind_direction'] = obs['winddir']
-            
-            # Precipitation
-            if imperial.get('precipRate') is not None:
-                data['precipitation_rate'] = imperial['precipRate']
-            
-            if imperial.get('precipTotal') is not None:
-                data['precipitation_accumulation'] = imperial['precipTotal']
-            
-            # Solar radiation
-            if obs.get('solarRadiation') is not None:
-                data['solar_radiation'] = obs['solarRadiation']
-            
-            # UV index
-            if obs.get('uv') is not None:
-                data['uv_index'] = obs['uv']
-            
-            _LOGGER.debug(f"Successfully fetched data for {self.station_id}: {len(data)} sensors")
-            
-            return data
-            
-        except requests.exceptions.Timeout:
-            raise UpdateFailed(f"Timeout while fetching data for station {self.station_id}")
-        except requests.exceptions.RequestException as e:
-            raise UpdateFailed(f"Error communicating with Weather.com API: {e}") from e
-        except (KeyError, ValueError) as e:
+        return data
+
+    async def _async_read_shared(self):
+        """Return the leader's last shared observation and its fetch time.
+
+        Returns (None, None) if there is none or it is older than one poll
+        interval plus a grace period.
+        """
+        shared = await self.election.async_read_observation(self.station_id)
+        if not isinstance(shared, dict) or not isinstance(shared.get("observation"), dict):
+            _LOGGER.debug(f"No shared observation for {self.station_id}, polling it directly")
+            return None, None
+
+        fetched = dt_util.parse_datetime(shared.get("fetched") or "")
+        max_age = self.update_interval.total_seconds() + SHARED_OBSERVATION_GRACE
+        if fetched is None or (dt_util.utcnow() - fetched).total_seconds() > max_age:
+            _LOGGER.debug(f"Shared observation for {self.station_id} is out of date, polling it directly")
+            return None, None
+        return shared["observation"], fetched
+
+    @callback
+    def async_seed(self, obs, fetched):
+        """Use an observation fetched elsewhere (e.g. the config flow probe) as current data."""
+        data = self._process_observation(obs, fetched)
+        self.async_set_updated_data(data)
+
+    def _process_observation(self, obs, fetched=None, shared=False):
+        """Parse a fresh observation and hand it to the optional consumers.
+
+        Observations ``shared`` by the polling leader are republished by the
+        leader, not here.
+        """
+        try:
+            data = parse_observation(obs, self.fields)
+        except (KeyError, ValueError, TypeError) as e:
             raise UpdateFailed(f"Error parsing API response: {e}") from e
-        except Exception as e:
-            raise UpdateFailed(f"Unexpected error occurred: {e}") from e
+
+        if self.fields is None or not self.fields.isdisjoint(PRECIPITATION_SENSORS):
+            imperial = obs.get('imperial')
+            if not isinstance(imperial, dict):
+                imperial = {}
+            obs_time_local = obs.get('obsTimeLocal')
+            self.precipitation.update(
+                as_number(obs.get('epoch')),
+                obs_time_local if isinstance(obs_time_local, str) else None,
+                as_number(imperial.get('precipTotal')),
+                as_number(imperial.get('precipRate')),
+            )
+            data.update(self.precipitation.sensor_values())
+        self.reported.update(data)
+
+        self.observation_epoch = as_number(obs.get('epoch'))
+        self.last_fetched = fetched or dt_util.utcnow()
+        self.stale = False
+
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_store, STORE_SAVE_DELAY)
+
+        if self.publisher is not None and not shared:
+            self.publisher.async_enqueue(self.station_id, self.observation_epoch, data)
+
+        if self.archive is not None and self.observation_epoch is not None:
+            self.hass.async_create_background_task(
+                self._async_archive(self.observation_epoch, data),
+                f"{DOMAIN} archive {self.station_id}",
+            )
+
+        _LOGGER.debug(f"Successfully fetched data for {self.station_id}: {len(data)} sensors")
+
+        return data
+
+    async def _async_archive(self, epoch, data):
+        """Append an observation to the local archive."""
+        try:
+            await self.hass.async_add_executor_job(
+                self.archive.append, self.station_id, epoch, data
+            )
+        except OSError as e:
+            _LOGGER.warning(f"Could not archive observation for {self.station_id}: {e}")
+
+
+def extract_station_id(url):
+    """Extract station ID from Wunderground URL."""
+    # Match pattern like: /pws/STATIONID (dashboard URL)
+    match = re.search(r'/pws/([A-Z0-9]+)', url)
+    if match:
+        return match.group(1)
+    
+    # Match pattern like: /weather/us/ma/city/STATIONID (weather page URL)
+    match = re.search(r'/weather/[^/]+/[^/]+/[^/]+/([A-Z0-9]+)', url)
+    if match:
+        return match.group(1)
+    
+    # Match any URL ending with a station ID pattern
+    match = re.search(r'/([A-Z]{2,4}[A-Z0-9]+\d+)/?$', url)
+    if match:
+        return match.group(1)
+    
+    # If URL is just the station ID itself
+    if re.match(r'^[A-Z0-9]+$', url):
+        return url
+    
+    return None
+
+
+def fahrenheit_to_celsius(fahrenheit):
+    """Convert Fahrenheit to Celsius."""
+    if fahrenheit is None:
+        return None
+
+    try:
+        celsius = (float(fahrenheit) - 32) * 5 / 9
+        return round(celsius, 1)
+    except (ValueError, TypeError):
+        _LOGGER.warning(f"Could not convert temperature '{fahrenheit}' to Celsius")
+        return None
+
+
+def _fetch(station_id):
+    """Fetch the current observations for a station from the Weather.com PWS API.
+
+    Runs in the executor. Raises WeatherComUnavailable for transport and
+    server errors and UpdateFailed for anything specific to the station.
+    """
+    # Imported here rather than at module level to keep it off HA's startup path
+    import requests
+
+    params = {
+        'apiKey': API_KEY,
+        'stationId': station_id,
+        'format': 'json',
+        'units': 'e',  # Imperial units
+        'numericPrecision': 'decimal'
+    }
+
+    try:
+        response = requests.get(API_ENDPOINT, params=params, timeout=10)
+    except requests.exceptions.Timeout as e:
+        raise WeatherComUnavailable(f"Timeout while fetching data for station {station_id}") from e
+    except requests.exceptions.RequestException as e:
+        raise WeatherComUnavailable(f"Error communicating with Weather.com API: {e}") from e
+
+    # Only server-side errors count against the upstream; a 204 or 4xx
+    # is a problem with this station, not with the API.
+    if response.status_code >= 500:
+        raise WeatherComUnavailable(
+            f"Weather.com API returned HTTP {response.status_code} for station {station_id}"
+        )
+
+    if response.status_code == 204:
+        raise StationNotReporting(f"Station {station_id} is not reporting data (HTTP 204)")
+
+    try:
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        raise UpdateFailed(f"Error communicating with Weather.com API: {e}") from e
+    except ValueError as e:
+        raise UpdateFailed(f"Error parsing API response: {e}") from e
+
+
+async def async_fetch_observation(hass: HomeAssistant, station_id):
+    """Fetch a station's current observation through the shared circuit breaker.
+
+    Raises WeatherComUnavailable when the API itself is down (or the breaker
+    is open) and UpdateFailed for problems specific to the station.
+    """
+    breaker = async_get_circuit_breaker(hass)
+    ticket = breaker.allow_request()
+    if ticket is None:
+        raise WeatherComUnavailable(
+            f"Weather.com API circuit is open, skipping update for station {station_id}"
+        )
+
+    # Make API request
+    try:
+        api_data = await hass.async_add_executor_job(_fetch, station_id)
+    except WeatherComUnavailable:
+        breaker.record_failure(ticket)
+        raise
+    except UpdateFailed:
+        if breaker.record_success(ticket):
+            _async_refresh_after_recovery(hass, station_id)
+        raise
+    if breaker.record_success(ticket):
+        _async_refresh_after_recovery(hass, station_id)
+
+    # Extract observation data
+    if not isinstance(api_data, dict):
+        raise UpdateFailed(f"Unexpected API response for station {station_id}: {api_data!r:.100}")
+
+    observations = api_data.get('observations')
+    if not observations or not isinstance(observations, list):
+        raise StationNotReporting(f"No observations data returned for station {station_id}")
+
+    obs = observations[0]
+    if not isinstance(obs, dict):
+        raise UpdateFailed(f"Unexpected observation for station {station_id}: {obs!r:.100}")
+
+    return obs
+
+
+@callback
+def _async_refresh_after_recovery(hass: HomeAssistant, probed_station_id):
+    """Refresh the other entries once a probe closes the circuit.
+
+    They would otherwise keep serving stale data until their own timers fire.
+    Refreshes are spaced out so recovery doesn't hit the API with a burst.
+    """
+    coordinators = [
+        coordinator for coordinator in hass.data.get(DOMAIN, {}).values()
+        if coordinator.station_id != probed_station_id
+    ]
+    for index, coordinator in enumerate(coordinators):
+        async def _async_refresh(_now, coordinator=coordinator):
+            await coordinator.async_request_refresh()
+
+        async_call_later(hass, (index + 1) * BREAKER_RECOVERY_STAGGER, _async_refresh)
+
+
+# Sensor key -> (observation section, API field); a section of None reads
+# the top level of the observation
+OBSERVATION_FIELDS = {
+    'temperature': ('imperial', 'temp'),
+    'dew_point': ('imperial', 'dewpt'),
+    'humidity': (None, 'humidity'),
+    'pressure': ('imperial', 'pressure'),
+    'wind_speed': ('imperial', 'windSpeed'),
+    'wind_gust': ('imperial', 'windGust'),
+    'wind_direction': (None, 'winddir'),
+    'precipitation_rate': ('imperial', 'precipRate'),
+    'precipitation_accumulation': ('imperial', 'precipTotal'),
+    'solar_radiation': (None, 'solarRadiation'),
+    'uv_index': (None, 'uv'),
+}
+
+
+def as_number(value):
+    """Return value if it is a finite number, else None.
+
+    The API occasionally sends strings, booleans or NaN for fields a station
+    does not report; those are treated as missing.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not math.isfinite(value):
+        return None
+    return value
+
+
+def parse_observation(obs, fields=None):
+    """Map a Weather.com observation to Home Assistant sensor data.
+
+    Only the sensor keys in ``fields`` are extracted; None extracts all.
+    """
+    # 'imperial' is null for some stations that only report metric units
+    imperial = obs.get('imperial')
+    if not isinstance(imperial, dict):
+        imperial = {}
+
+    # Map API data to Home Assistant sensor format
+    data = {}
+    for key, (section, api_field) in OBSERVATION_FIELDS.items():
+        if fields is not None and key not in fields:
+            continue
+        value = as_number((imperial if section else obs).get(api_field))
+        if value is not None:
+            data[key] = value
+
+    # Feels like (use heat index or wind chill, whichever is available).
+    # A heat index of 0 is a real reading, so don't fall through on falsy values.
+    if fields is None or 'feels_like' in fields:
+        feels_like = as_number(imperial.get('heatIndex'))
+        if feels_like is None:
+            feels_like = as_number(imperial.get('windChill'))
+        if feels_like is not None:
+            data['feels_like'] = feels_like
+
+    return data
@@ -0,0 +1,283 @@
+"""Leader election so several HA instances share one poller per station.
+
+Instances configured with the same coordination target compete for a single
+lease. The leader fetches from Weather.com and writes each observation to a
+shared cache; followers read observations from that cache instead of polling.
+The lease expires after ``LEASE_TTL`` seconds unless renewed, and every
+instance tries to take it over every ``LEASE_RENEW_INTERVAL`` seconds, so a
+dead leader is replaced well within one poll interval. The new leader
+refreshes right away instead of waiting for its next scheduled poll.
+
+Lease expiry uses wall clock time, so the instances' clocks must be kept in
+sync (e.g. NTP), and the file backend needs shared storage that honours
+``flock`` across hosts (NFSv4, SMB with locking, or a local disk).
+"""
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    COORDINATION_FILE,
+    DATA_LEADER_ELECTIONS,
+    LEASE_RENEW_INTERVAL,
+    LEASE_TTL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+LEASE_NAME = "wunderground_scraper_leader"
+
+
+class FileLeaseBackend:
+    """Lease and shared cache in a directory on shared storage.
+
+    Lease updates happen under an exclusive ``flock`` on a lock file so two
+    instances can never both see the lease as free.
+    """
+
+    def __init__(self, directory):
+        """Initialize."""
+        self._directory = directory
+        self._lease_path = os.path.join(directory, f"{LEASE_NAME}.json")
+        self._lock_path = os.path.join(directory, f"{LEASE_NAME}.lock")
+
+    def try_acquire(self, holder, ttl):
+        """Take or renew the lease; return True if holder now owns it."""
+        # Imported here, fcntl only exists on POSIX systems
+        import fcntl
+
+        os.makedirs(self._directory, exist_ok=True)
+        with open(self._lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                lease = self._read_json(self._lease_path)
+                now = time.time()
+                if lease and lease.get("holder") != holder and lease.get("expires", 0) > now:
+                    return False
+                self._write_json(self._lease_path, {"holder": holder, "expires": now + ttl})
+                return True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def release(self, holder):
+        """Give up the lease if holder owns it."""
+        import fcntl
+
+        with open(self._lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                lease = self._read_json(self._lease_path)
+                if lease and lease.get("holder") == holder:
+                    os.remove(self._lease_path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def read_observation(self, station_id):
+        """Return the shared cache entry for a station, or None."""
+        return self._read_json(os.path.join(self._directory, f"{station_id}.json"))
+
+    def write_observation(self, station_id, entry):
+        """Replace the shared cache entry for a station."""
+        self._write_json(os.path.join(self._directory, f"{station_id}.json"), entry)
+
+    @staticmethod
+    def _read_json(path):
+        """Read a JSON file, treating missing or partial files as empty."""
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path, value):
+        """Write a JSON file atomically so readers never see partial data."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(value, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+
+class RedisLeaseBackend:
+    """Lease and shared cache in a Redis-compatible server."""
+
+    # Renew if we hold the lease, otherwise take it only if nobody does
+    _ACQUIRE = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('pexpire', KEYS[1], ARGV[2])
+    end
+    if redis.call('set', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+        return 1
+    end
+    return 0
+    """
+
+    _RELEASE = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url):
+        """Initialize."""
+        self._url = url
+        self._client = None
+
+    @property
+    def client(self):
+        """Return the client, connecting on first use."""
+        if self._client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise OSError("Redis coordination requires the redis package") from e
+            self._client = redis.Redis.from_url(self._url, decode_responses=True)
+        return self._client
+
+    def _command(self, name, *args):
+        """Run a Redis command, reporting Redis errors as OSError like the file backend."""
+        client = self.client
+        from redis.exceptions import RedisError
+
+        try:
+            return getattr(client, name)(*args)
+        except RedisError as e:
+            raise OSError(f"Redis command {name} failed: {e}") from e
+
+    def try_acquire(self, holder, ttl):
+        """Take or renew the lease; return True if holder now owns it."""
+        return bool(self._command("eval", self._ACQUIRE, 1, LEASE_NAME, holder, int(ttl * 1000)))
+
+    def release(self, holder):
+        """Give up the lease if holder owns it."""
+        self._command("eval", self._RELEASE, 1, LEASE_NAME, holder)
+
+    def read_observation(self, station_id):
+        """Return the shared cache entry for a station, or None."""
+        value = self._command("get", f"{LEASE_NAME}:{station_id}")
+        try:
+            return json.loads(value) if value else None
+        except ValueError:
+            return None
+
+    def write_observation(self, station_id, entry):
+        """Replace the shared cache entry for a station."""
+        self._command(
+            "set", f"{LEASE_NAME}:{station_id}", json.dumps(entry, separators=(",", ":"))
+        )
+
+
+class LeaderElection:
+    """Track whether this instance holds the lease and share observations."""
+
+    def __init__(self, hass: HomeAssistant, backend, instance_id):
+        """Initialize."""
+        self.hass = hass
+        self.is_leader = False
+        self._backend = backend
+        # A standby restored from the primary's backup shares its instance
+        # ID, so a per-process token keeps the two holders distinct
+        self._holder = f"{instance_id}:{uuid4().hex}"
+        self._listeners = []
+        self._unsub_renew = None
+        self._first_renew = None
+        self._users = 0
+
+    async def async_start(self):
+        """Try to take the lease now and keep renewing or contesting it."""
+        self._users += 1
+        # Entries set up concurrently; only the first starts the timer (before
+        # awaiting anything) and the others wait for the same first attempt
+        if self._unsub_renew is None:
+            self._unsub_renew = async_track_time_interval(
+                self.hass, self._async_renew, timedelta(seconds=LEASE_RENEW_INTERVAL)
+            )
+            self._first_renew = self.hass.async_create_task(self._async_renew())
+        await self._first_renew
+
+    async def async_stop(self):
+        """Stop once the last config entry using this election unloads."""
+        self._users -= 1
+        if self._users > 0 or self._unsub_renew is None:
+            return
+        self._unsub_renew()
+        self._unsub_renew = None
+        # Let a first attempt still in flight settle so its lease is released
+        await self._first_renew
+        if self.is_leader:
+            self.is_leader = False
+            try:
+                await self.hass.async_add_executor_job(self._backend.release, self._holder)
+            except OSError as e:
+                _LOGGER.warning(f"Could not release the polling lease: {e}")
+
+    @callback
+    def async_add_listener(self, listener):
+        """Call listener whenever this instance becomes the leader."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener():
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    async def _async_renew(self, _now=None):
+        """Renew the lease if held, or take it over if it expired."""
+        try:
+            leader = await self.hass.async_add_executor_job(
+                self._backend.try_acquire, self._holder, LEASE_TTL
+            )
+        except OSError as e:
+            # Without the lease there is no shared cache to follow either, so
+            # poll independently rather than leave the sensors without data
+            _LOGGER.warning(f"Could not reach the polling lease, polling independently: {e}")
+            leader = True
+
+        if leader and not self.is_leader:
+            _LOGGER.info("This instance is now the Weather.com polling leader")
+            self.is_leader = True
+            for listener in list(self._listeners):
+                listener()
+        elif not leader and self.is_leader:
+            _LOGGER.info("Lost the Weather.com polling lease, following the shared cache")
+            self.is_leader = False
+
+    async def async_read_observation(self, station_id):
+        """Return the leader's latest cache entry for a station, or None."""
+        try:
+            return await self.hass.async_add_executor_job(
+                self._backend.read_observation, station_id
+            )
+        except OSError as e:
+            _LOGGER.warning(f"Could not read shared observation for {station_id}: {e}")
+            return None
+
+    async def async_write_observation(self, station_id, entry):
+        """Publish an observation to the followers."""
+        try:
+            await self.hass.async_add_executor_job(
+                self._backend.write_observation, station_id, entry
+            )
+        except OSError as e:
+            _LOGGER.warning(f"Could not write shared observation for {station_id}: {e}")
+
+
+def async_get_leader_election(hass: HomeAssistant, mode, target, instance_id) -> LeaderElection:
+    """Return the election for a coordination target, shared by all entries using it."""
+    elections = hass.data.setdefault(DATA_LEADER_ELECTIONS, {})
+    key = (mode, target)
+    if key not in elections:
+        if mode == COORDINATION_FILE:
+            backend = FileLeaseBackend(target)
+        else:
+            backend = RedisLeaseBackend(target)
+        elections[key] = LeaderElection(hass, backend, instance_id)
+    return elections[key]
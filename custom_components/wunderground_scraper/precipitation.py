@@ -0,0 +1,145 @@
+"""Precipitation accounting across daily resets and rain event detection."""
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Drops in precipTotal smaller than this (in) are treated as station
+# corrections rather than a reset to zero
+RESET_TOLERANCE = 0.02
+
+# A rain event ends after this long without rain (seconds)
+RAIN_EVENT_GAP = 1800
+
+# Sensor keys produced by the tracker
+PRECIPITATION_SENSORS = frozenset(
+    [
+        "precipitation_total",
+        "rain_event_duration",
+        "rain_event_accumulation",
+        "rain_event_intensity",
+    ]
+)
+
+
+class PrecipitationTracker:
+    """Turn a station's daily precipTotal into a monotonic counter.
+
+    Weather.com's ``precipTotal`` is the accumulation since the station's
+    local midnight. Each observation contributes the increase since the
+    previous one; when the local date in ``obsTimeLocal`` changes (or the
+    value drops because the station reset) the new day's total so far is
+    counted from zero. Rain that fell between the last poll of a day and its
+    midnight cannot be recovered if those polls were missed.
+
+    Rain events start with the interval leading up to the first observation
+    with a non-zero ``precipRate`` or a total increase (the rain it reports
+    fell during that interval) and end after ``RAIN_EVENT_GAP`` seconds
+    without either. Until an event spans an interval, its intensity is the
+    reported ``precipRate``.
+
+    The state is a small dict of plain values so it can be persisted as-is.
+    """
+
+    def __init__(self, state=None):
+        """Initialize, optionally from persisted state."""
+        self._state = {
+            "epoch": None,  # epoch of the last observation accounted for
+            "date": None,  # local date of that observation
+            "daily": None,  # its precipTotal
+            "total": 0.0,  # monotonic accumulation
+            "event_start": None,
+            "event_last_wet": None,
+            "event_total": 0.0,
+            "rate": None,  # precipRate of the last observation
+            "seen": False,  # whether the station has ever reported precipitation
+        }
+        if state:
+            self._state.update(state)
+
+    def as_dict(self):
+        """Return the state for persistence."""
+        return dict(self._state)
+
+    def update(self, epoch, obs_time_local, daily, rate):
+        """Account for a new observation; return True if it changed the state.
+
+        ``daily`` and ``rate`` are the observation's precipTotal and
+        precipRate, already validated as numbers or None.
+        """
+        state = self._state
+
+        if daily is None and rate is None:
+            return False
+        if epoch is None or (state["epoch"] is not None and epoch <= state["epoch"]):
+            # Duplicate or out-of-order observation
+            return False
+
+        previous_epoch = state["epoch"]
+        date = (obs_time_local or "")[:10] or None
+        delta = 0.0
+        if daily is not None:
+            if state["daily"] is None or state["date"] is None:
+                # First reading: start counting from here
+                pass
+            elif date is not None and date < state["date"]:
+                return False
+            elif date is not None and date != state["date"]:
+                # Local day rolled over, the new day's total is all new rain
+                delta = daily
+            elif daily >= state["daily"]:
+                delta = daily - state["daily"]
+            elif daily < state["daily"] - RESET_TOLERANCE:
+                _LOGGER.debug(f"precipTotal dropped from {state['daily']} to {daily}, treating as reset")
+                delta = daily
+            state["daily"] = daily
+            state["date"] = date or state["date"]
+
+        state["epoch"] = epoch
+        state["rate"] = rate
+        state["seen"] = True
+        state["total"] = round(state["total"] + delta, 4)
+
+        wet = delta > 0 or (rate is not None and rate > 0)
+        if wet:
+            if state["event_start"] is None:
+                # Count the interval the rain fell in, unless there is no
+                # recent observation to measure it from
+                if previous_epoch is not None and epoch - previous_epoch <= RAIN_EVENT_GAP:
+                    state["event_start"] = previous_epoch
+                else:
+                    state["event_start"] = epoch
+                state["event_total"] = 0.0
+            state["event_last_wet"] = epoch
+            state["event_total"] = round(state["event_total"] + delta, 4)
+        elif (
+            state["event_start"] is not None
+            and epoch - state["event_last_wet"] >= RAIN_EVENT_GAP
+        ):
+            state["event_start"] = None
+            state["event_last_wet"] = None
+            state["event_total"] = 0.0
+        return True
+
+    def sensor_values(self):
+        """Return the derived sensor values, or {} if there is no rain gauge."""
+        state = self._state
+        if not state["seen"]:
+            return {}
+
+        duration = 0
+        intensity = 0.0
+        if state["event_start"] is not None:
+            # Measured to the last wet observation so the dry tail before the
+            # event ends does not dilute the intensity
+            duration = max(state["event_last_wet"] - state["event_start"], 0)
+            if duration:
+                intensity = round(state["event_total"] / (duration / 3600), 2)
+            elif state["rate"] is not None:
+                intensity = state["rate"]
+
+        return {
+            "precipitation_total": state["total"],
+            "rain_event_duration": round(duration / 60),
+            "rain_event_accumulation": state["event_total"],
+            "rain_event_intensity": intensity,
+        }
@@ -0,0 +1,137 @@
+"""Republish observations to MQTT or a webhook for downstream consumers."""
+import asyncio
+import json
+import logging
+from collections import deque
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    DATA_PUBLISHERS,
+    PUBLISH_BATCH_DELAY,
+    PUBLISH_QUEUE_SIZE,
+    PUBLISH_TARGET_MQTT,
+    PUBLISH_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ObservationPublisher:
+    """Fan out each new observation once, off the refresh path.
+
+    The coordinator hands observations over with `async_enqueue`, which never
+    awaits. A background task collects whatever arrived within a short batch
+    window and publishes it; a slow or dead subscriber only delays that task
+    (bounded by a timeout) and, once the queue is full, drops the oldest
+    observations instead of growing without limit.
+
+    One publisher is shared by every entry with the same destination (see
+    `async_get_publisher`), so a batch can hold several stations.
+    """
+
+    def __init__(self, hass: HomeAssistant, target, topic_prefix=None, webhook_url=None):
+        """Initialize."""
+        self.hass = hass
+        self._target = target
+        self._topic_prefix = (topic_prefix or "").rstrip("/")
+        self._webhook_url = webhook_url
+        self._queue = deque(maxlen=PUBLISH_QUEUE_SIZE)
+        self._last_epoch = {}
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._users = 0
+
+    @callback
+    def async_start(self):
+        """Start the background publishing task for another entry."""
+        self._users += 1
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._run(), f"wunderground_scraper publisher ({self._target})"
+            )
+
+    @callback
+    def async_stop(self):
+        """Stop publishing and drop anything queued once the last entry unloads."""
+        self._users -= 1
+        if self._users > 0:
+            return
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._queue.clear()
+
+    @callback
+    def async_enqueue(self, station_id, epoch, data):
+        """Queue an observation unless it was already published."""
+        if epoch is not None:
+            if self._last_epoch.get(station_id) == epoch:
+                return
+            self._last_epoch[station_id] = epoch
+
+        self._queue.append({"station": station_id, "epoch": epoch, **data})
+        self._wakeup.set()
+
+    async def _run(self):
+        """Publish queued observations in batches."""
+        while True:
+            await self._wakeup.wait()
+            # Let observations from other entries land in the same batch
+            await asyncio.sleep(PUBLISH_BATCH_DELAY)
+            self._wakeup.clear()
+
+            batch = list(self._queue)
+            self._queue.clear()
+            if not batch:
+                continue
+
+            try:
+                async with asyncio.timeout(PUBLISH_TIMEOUT):
+                    if self._target == PUBLISH_TARGET_MQTT:
+                        await self._publish_mqtt(batch)
+                    else:
+                        await self._publish_webhook(batch)
+            except (TimeoutError, aiohttp.ClientError, HomeAssistantError) as e:
+                _LOGGER.warning(
+                    f"Could not publish {len(batch)} observation(s) via {self._target}: {e!r}"
+                )
+
+    async def _publish_mqtt(self, batch):
+        """Publish one compact JSON message per observation."""
+        # Imported here so the MQTT integration is only loaded when used
+        from homeassistant.components import mqtt
+
+        for observation in batch:
+            topic = f"{self._topic_prefix}/{observation['station']}"
+            await mqtt.async_publish(self.hass, topic, _to_json(observation))
+
+    async def _publish_webhook(self, batch):
+        """POST the whole batch as a single JSON array."""
+        session = async_get_clientsession(self.hass)
+        async with session.post(
+            self._webhook_url,
+            data=_to_json(batch),
+            headers={"Content-Type": "application/json"},
+        ) as response:
+            response.raise_for_status()
+
+
+def async_get_publisher(
+    hass: HomeAssistant, target, topic_prefix=None, webhook_url=None
+) -> ObservationPublisher:
+    """Return the publisher for a destination, shared by all entries using it."""
+    publishers = hass.data.setdefault(DATA_PUBLISHERS, {})
+    key = (target, topic_prefix if target == PUBLISH_TARGET_MQTT else webhook_url)
+    if key not in publishers:
+        publishers[key] = ObservationPublisher(hass, target, topic_prefix, webhook_url)
+    return publishers[key]
+
+
+def _to_json(value):
+    """Serialize without whitespace."""
+    return json.dumps(value, separators=(",", ":"))
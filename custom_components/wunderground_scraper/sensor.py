@@ -4,12 +4,13 @@ import logging
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .coordinator import WundergroundDataUpdateCoordinator
+from .const import CONF_SENSORS, DOMAIN
+from .coordinator import WundergroundDataUpdateCoordinator, fahrenheit_to_celsius
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -54,6 +55,29 @@ SENSOR_TYPES = {
         "unit": "in",
         "device_class": SensorDeviceClass.PRECIPITATION,
     },
+    "precipitation_total": {
+        "name": "Precipitation Total",
+        "unit": "in",
+        "device_class": SensorDeviceClass.PRECIPITATION,
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+    },
+    "rain_event_duration": {
+        "name": "Rain Event Duration",
+        "unit": "min",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
+    "rain_event_accumulation": {
+        "name": "Rain Event Accumulation",
+        "unit": "in",
+        "device_class": SensorDeviceClass.PRECIPITATION,
+    },
+    "rain_event_intensity": {
+        "name": "Rain Event Intensity",
+        "unit": "in/h",
+        "device_class": SensorDeviceClass.PRECIPITATION_INTENSITY,
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
     "feels_like": {
         "name": "Feels Like",
         "unit": "°F",
@@ -65,6 +89,7 @@ SENSOR_TYPES = {
         "device_class": None,  # Bypass HA's automatic unit conversion
         "state_class": SensorStateClass.MEASUREMENT,
         "temperature_sensor": True,  # Custom attribute to identify as temperature
+        "source": "temperature",  # Converted from this sensor's value when read
     },
     "feels_like_celsius": {
         "name": "Feels Like (Celsius)",
@@ -72,6 +97,7 @@ SENSOR_TYPES = {
         "device_class": None,  # Bypass HA's automatic unit conversion
         "state_class": SensorStateClass.MEASUREMENT,
         "temperature_sensor": True,  # Custom attribute to identify as temperature
+        "source": "feels_like",  # Converted from this sensor's value when read
     },
     "dew_point_celsius": {
         "name": "Dew Point (Celsius)",
@@ -79,6 +105,7 @@ SENSOR_TYPES = {
         "device_class": None,  # Bypass HA's automatic unit conversion
         "state_class": SensorStateClass.MEASUREMENT,
         "temperature_sensor": True,  # Custom attribute to identify as temperature
+        "source": "dew_point",  # Converted from this sensor's value when read
     },
     "visibility": {
         "name": "Visibility",
@@ -117,6 +144,24 @@ SENSOR_TYPES = {
 }
 
 
+def required_fields(sensor_types):
+    """Return the coordinator data keys needed to serve the given sensors."""
+    return {SENSOR_TYPES[sensor_type].get("source", sensor_type) for sensor_type in sensor_types}
+
+
+def _enabled_sensor_types(registry, config_entry, sensor_types):
+    """Return the sensor types whose entities are new or not disabled."""
+    enabled = []
+    for sensor_type in sensor_types:
+        entity_id = registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{config_entry.unique_id}_{sensor_type}"
+        )
+        entity_entry = registry.async_get(entity_id) if entity_id else None
+        if entity_entry is None or not entity_entry.disabled:
+            enabled.append(sensor_type)
+    return enabled
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -126,29 +171,59 @@ async def async_setup_entry(
     coordinator: WundergroundDataUpdateCoordinator = hass.data[DOMAIN][
         config_entry.entry_id
     ]
+    registry = er.async_get(hass)
+    selected = config_entry.options.get(CONF_SENSORS, list(SENSOR_TYPES))
 
     sensors = []
+    sensor_types = []
+
+    for sensor_type, sensor_info in SENSOR_TYPES.items():
+        unique_id = f"{config_entry.unique_id}_{sensor_type}"
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+
+        if sensor_type not in selected:
+            # Deselected in the options, drop any entity created earlier
+            if entity_id is not None:
+                registry.async_remove(entity_id)
+            continue
 
-    # Define temperature sensor mappings for Celsius creation
-    celsius_mappings = {
-        "temperature_celsius": "temperature",
-        "feels_like_celsius": "feels_like",
-        "dew_point_celsius": "dew_point"
-    }
+        # Create the sensor if the station has reported its data (Celsius
+        # sensors use their Fahrenheit source), or if it was created before
+        # and is disabled, so it can still be re-enabled. The reported keys
+        # are used rather than the data, which only holds the parsed fields.
+        source = sensor_info.get("source", sensor_type)
+        if not (source in coordinator.reported or entity_id is not None):
+            continue
 
-    for sensor_type in SENSOR_TYPES:
-        should_create = False
+        sensors.append(WundergroundSensor(coordinator, config_entry, sensor_type))
+        sensor_types.append(sensor_type)
 
-        if sensor_type in celsius_mappings:
-            # For Celsius sensors, create if the corresponding Fahrenheit sensor exists
-            fahrenheit_sensor = celsius_mappings[sensor_type]
-            should_create = coordinator.data and fahrenheit_sensor in coordinator.data
-        else:
-            # For all other sensors, create if data exists
-            should_create = coordinator.data and sensor_type in coordinator.data
+    # Disabled entities are never added to HA, so they never register a
+    # coordinator listener; their fields are not parsed either.
+    coordinator.async_set_fields(
+        required_fields(_enabled_sensor_types(registry, config_entry, sensor_types))
+    )
 
-        if should_create:
-            sensors.append(WundergroundSensor(coordinator, config_entry, sensor_type))
+    @callback
+    def _async_registry_updated(event: Event) -> None:
+        """Recompute the parsed fields when one of our entities is disabled or enabled.
+
+        Disabling an entity at runtime only removes it from HA; without this
+        its field would be parsed until the next reload. (Enabling one also
+        reloads the entry.)
+        """
+        if event.data["action"] != "update" or "disabled_by" not in event.data["changes"]:
+            return
+        entity_entry = registry.async_get(event.data["entity_id"])
+        if entity_entry is None or entity_entry.config_entry_id != config_entry.entry_id:
+            return
+        coordinator.async_set_fields(
+            required_fields(_enabled_sensor_types(registry, config_entry, sensor_types))
+        )
+
+    config_entry.async_on_unload(
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, _async_registry_updated)
+    )
 
     async_add_entities(sensors)
 
@@ -156,6 +231,9 @@ async def async_setup_entry(
 class WundergroundSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Sensor."""
 
+    # Changes on every poll; recording it would write a new attribute row each time
+    _unrecorded_attributes = frozenset({"last_fetched"})
+
     def __init__(
         self,
         coordinator: WundergroundDataUpdateCoordinator,
@@ -166,6 +244,7 @@ class WundergroundSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self._sensor_type = sensor_type
         sensor_info = SENSOR_TYPES[sensor_type]
+        self._source = sensor_info.get("source", sensor_type)
 
         self._attr_name = f"{config_entry.title} {sensor_info['name']}"
         self._attr_native_unit_of_measurement = sensor_info["unit"]
@@ -174,20 +253,31 @@ class WundergroundSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{config_entry.unique_id}_{self._sensor_type}"
 
         # Add custom attributes for Celsius sensors
+        self._static_attributes = {}
         if sensor_info.get("temperature_sensor"):
-            self._attr_extra_state_attributes = {
+            self._static_attributes = {
                 "temperature_sensor": True,
                 "original_unit": "fahrenheit",
                 "conversion_applied": True
             }
 
-
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if self.coordinator.data:
-            return self.coordinator.data.get(self._sensor_type)
-        return None
+        if not self.coordinator.data:
+            return None
+        if self._source != self._sensor_type:
+            return fahrenheit_to_celsius(self.coordinator.data.get(self._source))
+        return self.coordinator.data.get(self._sensor_type)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes, including data staleness."""
+        attributes = dict(self._static_attributes)
+        if self.coordinator.last_fetched is not None:
+            attributes["last_fetched"] = self.coordinator.last_fetched.isoformat()
+        attributes["stale"] = self.coordinator.stale
+        return attributes
 
     @property
     def available(self) -> bool:
@@ -196,14 +286,4 @@ class WundergroundSensor(CoordinatorEntity, SensorEntity):
             return False
 
         # For Celsius sensors, check if corresponding Fahrenheit sensor exists
-        celsius_mappings = {
-            "temperature_celsius": "temperature",
-            "feels_like_celsius": "feels_like",
-            "dew_point_celsius": "dew_point"
-        }
-
-        if self._sensor_type in celsius_mappings:
-            fahrenheit_sensor = celsius_mappings[self._sensor_type]
-            return fahrenheit_sensor in self.coordinator.data
-        else:
-            return self._sensor_type in self.coordinator.data
+        return self._source in self.coordinator.data
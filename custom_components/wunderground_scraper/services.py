@@ -0,0 +1,203 @@
+"""Services for the Wunderground Scraper integration."""
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .archive import ARCHIVE_FIELDS, EXPORT_FORMAT_CSV, EXPORT_FORMATS, ArchiveReader
+from .cache import async_get_observation_cache
+from .const import (
+    ARCHIVE_DIR,
+    DOMAIN,
+    REFRESH_MIN_INTERVAL,
+    SERVICE_CLEAR_CACHE,
+    SERVICE_EXPORT_ARCHIVE,
+    SERVICE_GET_OBSERVATION,
+    SERVICE_REFRESH,
+)
+from .coordinator import extract_station_id
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _station(value):
+    """Validate a station URL or ID and return the station ID."""
+    value = cv.string(value).strip()
+    # Station IDs are upper case; accept one typed in lower case
+    station_id = extract_station_id(value) or extract_station_id(value.upper())
+    if not station_id:
+        raise vol.Invalid(f"Invalid station URL or ID: {value}")
+    return station_id
+
+
+def _station_list(value):
+    """Validate a list of station URLs or IDs and return the station IDs."""
+    stations = []
+    for item in cv.ensure_list(value):
+        station_id = _station(item)
+        if station_id not in stations:
+            stations.append(station_id)
+    return stations
+
+
+REFRESH_SCHEMA = vol.Schema({vol.Optional("stations"): _station_list})
+
+GET_OBSERVATION_SCHEMA = vol.Schema({vol.Required("stations"): _station_list})
+
+EXPORT_ARCHIVE_SCHEMA = vol.Schema(
+    {
+        vol.Required("station"): _station,
+        vol.Required("start"): cv.datetime,
+        vol.Required("end"): cv.datetime,
+        vol.Required("path"): cv.string,
+        vol.Optional("format", default=EXPORT_FORMAT_CSV): vol.In(EXPORT_FORMATS),
+        vol.Optional("fields"): vol.All(cv.ensure_list, [vol.In(ARCHIVE_FIELDS)]),
+        vol.Optional("interval"): vol.All(
+            cv.time_period, lambda period: int(period.total_seconds()), vol.Range(min=1)
+        ),
+    }
+)
+
+
+def _coordinators_by_station(hass: HomeAssistant):
+    """Return the loaded coordinators grouped by station ID."""
+    coordinators = {}
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        coordinators.setdefault(coordinator.station_id, []).append(coordinator)
+    return coordinators
+
+
+def _age(fetched):
+    """Return seconds since a fetch, or None if it never happened."""
+    if fetched is None:
+        return None
+    return (dt_util.utcnow() - fetched).total_seconds()
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def async_refresh(call: ServiceCall):
+        """Refresh stations now, skipping ones fetched very recently."""
+        coordinators = _coordinators_by_station(hass)
+        cache = async_get_observation_cache(hass)
+        stations = call.data.get("stations") or list(coordinators)
+
+        refreshes = []
+        for station_id in stations:
+            if station_id in coordinators:
+                for coordinator in coordinators[station_id]:
+                    age = _age(coordinator.last_fetched)
+                    if age is not None and age < REFRESH_MIN_INTERVAL:
+                        _LOGGER.debug(f"Skipping refresh of {station_id}, fetched {age:.0f}s ago")
+                        continue
+                    # Debounced by the coordinator, so repeated calls coalesce
+                    refreshes.append(coordinator.async_request_refresh())
+            elif cache.get(station_id, REFRESH_MIN_INTERVAL) is None:
+                refreshes.append(cache.async_fetch(station_id))
+            else:
+                _LOGGER.debug(f"Skipping refresh of {station_id}, fetched recently")
+
+        for result in await asyncio.gather(*refreshes, return_exceptions=True):
+            if isinstance(result, UpdateFailed):
+                _LOGGER.warning(f"Refresh failed: {result}")
+            elif isinstance(result, Exception):
+                raise result
+
+    async def async_get_observation(call: ServiceCall):
+        """Return the current observation for each station."""
+        coordinators = _coordinators_by_station(hass)
+        cache = async_get_observation_cache(hass)
+
+        async def async_lookup(station_id):
+            for coordinator in coordinators.get(station_id, []):
+                if coordinator.data is not None:
+                    return {
+                        "data": coordinator.data,
+                        "epoch": coordinator.observation_epoch,
+                        "fetched": coordinator.last_fetched,
+                        "stale": coordinator.stale,
+                    }
+
+            entry = cache.get(station_id)
+            if entry is None:
+                try:
+                    entry = await cache.async_fetch(station_id)
+                except UpdateFailed as e:
+                    return {"error": str(e)}
+            return {
+                "data": entry["data"],
+                "epoch": entry["epoch"],
+                "fetched": entry["fetched"],
+                "stale": False,
+            }
+
+        stations = call.data["stations"]
+        results = await asyncio.gather(*(async_lookup(station) for station in stations))
+
+        response = {}
+        for station_id, result in zip(stations, results):
+            if result.get("fetched") is not None:
+                result["fetched"] = result["fetched"].isoformat()
+            response[station_id] = result
+        return {"stations": response}
+
+    async def async_clear_cache(call: ServiceCall):
+        """Drop cached on-demand observations."""
+        async_get_observation_cache(hass).clear()
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_OBSERVATION,
+        async_get_observation,
+        schema=GET_OBSERVATION_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_CLEAR_CACHE, async_clear_cache)
+
+    async def async_export_archive(call: ServiceCall):
+        """Export a station's archived observations to a file."""
+        path = call.data["path"]
+        if not hass.config.is_allowed_path(path):
+            raise HomeAssistantError(
+                f"Cannot write to {path}, add its directory to allowlist_external_dirs"
+            )
+
+        start = int(dt_util.as_timestamp(dt_util.as_utc(call.data["start"])))
+        end = int(dt_util.as_timestamp(dt_util.as_utc(call.data["end"])))
+        reader = ArchiveReader(hass.config.path(ARCHIVE_DIR))
+
+        try:
+            rows = await hass.async_add_executor_job(
+                lambda: reader.export(
+                    call.data["station"],
+                    start,
+                    end,
+                    path,
+                    call.data["format"],
+                    fields=call.data.get("fields"),
+                    interval=call.data.get("interval"),
+                )
+            )
+        except (OSError, RuntimeError) as e:
+            raise HomeAssistantError(f"Archive export failed: {e}") from e
+
+        _LOGGER.info(f"Exported {rows} archived observations to {path}")
+        return {"rows": rows, "path": path}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_ARCHIVE,
+        async_export_archive,
+        schema=EXPORT_ARCHIVE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
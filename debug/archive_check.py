@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the observation archive (archive.py).
+Needs no Home Assistant; the Parquet check runs only if pyarrow is installed.
+Usage: python debug/archive_check.py
+"""
+import csv
+import importlib.util
+import math
+import os
+import sys
+import tempfile
+from array import array
+
+ARCHIVE_PY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..", "custom_components", "wunderground_scraper", "archive.py",
+)
+
+# Loaded by path so the integration package (and Home Assistant) isn't imported
+spec = importlib.util.spec_from_file_location("archive", ARCHIVE_PY)
+archive = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(archive)
+
+STATION = "KTEST1"
+DAY_START = 1763942400  # 2025-11-24 00:00:00 UTC
+
+failures = []
+
+
+def check(name, condition, detail=""):
+    print(f"  {'✅' if condition else '❌'} {name}{': ' + detail if detail and not condition else ''}")
+    if not condition:
+        failures.append(name)
+
+
+def read_rows(reader, start, end):
+    rows = []
+    for epochs, columns in reader.scan(STATION, start, end, ["temperature", "humidity"]):
+        rows += [
+            (epoch, columns["temperature"][i], columns["humidity"][i])
+            for i, epoch in enumerate(epochs)
+        ]
+    return rows
+
+
+def check_torn_row(base):
+    """A crash between column writes must not shift later rows."""
+    writer = archive.ArchiveWriter(base)
+    reader = archive.ArchiveReader(base)
+    writer.append(STATION, DAY_START + 3600, {"temperature": 70.0, "humidity": 50})
+    writer.append(STATION, DAY_START + 3900, {"temperature": 71.0, "humidity": 51})
+
+    # Simulate a crash: some value columns and half an epoch got written
+    segment = os.path.join(base, STATION, "2025-11-24")
+    for field in archive.ARCHIVE_FIELDS[:5]:
+        with open(os.path.join(segment, field + archive.FIELD_SUFFIX), "ab") as column:
+            array("d", [999.0]).tofile(column)
+    with open(os.path.join(segment, archive.EPOCH_COLUMN), "ab") as column:
+        column.write(b"\x00" * 4)
+
+    check("torn row hidden from readers", len(read_rows(reader, DAY_START, DAY_START + 86400)) == 2)
+
+    writer.append(STATION, DAY_START + 4800, {"temperature": 72.0, "humidity": 52})
+    rows = read_rows(reader, DAY_START, DAY_START + 86400)
+    check("rows after a torn write", len(rows) == 3, repr(rows))
+    check(
+        "values stay aligned with epochs",
+        rows[-1] == (DAY_START + 4800, 72.0, 52.0),
+        repr(rows[-1]),
+    )
+    sizes = {
+        name: os.path.getsize(os.path.join(segment, name)) for name in os.listdir(segment)
+    }
+    check("every column holds the same rows", set(sizes.values()) == {3 * archive.ROW_SIZE}, repr(sizes))
+
+
+def check_export(base, tmp):
+    """CSV (and Parquet when available) exports match the scanned rows."""
+    reader = archive.ArchiveReader(base)
+    path = os.path.join(tmp, "export.csv")
+    count = reader.export(STATION, DAY_START, DAY_START + 86400, path, fields=["temperature"])
+    with open(path) as f:
+        exported = list(csv.reader(f))[1:]
+    check("csv export", count == 3 and exported[-1] == [str(DAY_START + 4800), "72.0"], repr(exported))
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("  ⏭️  parquet export (pyarrow not installed)")
+        return
+
+    path = os.path.join(tmp, "export.parquet")
+    count = reader.export(STATION, DAY_START, DAY_START + 86400, path, "parquet", ["temperature"])
+    table = pq.read_table(path)
+    check("parquet export", count == 3 and table.column("temperature").to_pylist()[-1] == 72.0)
+
+    count = reader.export(STATION, DAY_START, DAY_START + 86400, path, "parquet", ["temperature"], 3600)
+    means = pq.read_table(path).column("temperature").to_pylist()
+    check("parquet downsampled export", count == 1 and math.isclose(means[0], 71.0), repr(means))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, "archive")
+        print("🗄️  Archive checks")
+        check_torn_row(base)
+        check_export(base, tmp)
+
+    print(f"\n📈 Failures: {len(failures)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark config entry setup time against the fake Weather.com API.
+Requires Home Assistant to be installed (pip install homeassistant).
+Usage: python debug/bench_startup.py [--entries 60] [--latency 0.3]
+
+Runs two passes against the same temporary config directory:
+  cold - no persisted observation, setup waits for the first fetch
+  warm - setup restores the persisted observation and fetches in the background
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from fake_api import FakeWeatherApi
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+INTEGRATION = "custom_components.wunderground_scraper"
+
+
+class BenchEntry(SimpleNamespace):
+    """The parts of a ConfigEntry that async_setup_entry uses."""
+
+    def async_on_unload(self, func):
+        self.unload_callbacks.append(func)
+
+    def add_update_listener(self, listener):
+        return lambda: None
+
+
+def make_entry(index):
+    station_id = f"KBENCH{index:04d}"
+    return BenchEntry(
+        entry_id=f"bench{index:04d}",
+        title=station_id,
+        unique_id=station_id,
+        data={"url": station_id},
+        options={},
+        unload_callbacks=[],
+    )
+
+
+async def run_pass(config_dir, integration, entries):
+    """Set up every entry on a fresh hass instance and return per-entry times."""
+    from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+    from homeassistant.core import HomeAssistant
+
+    hass = HomeAssistant(config_dir)
+
+    async def forward_entry_setups(entry, platforms):
+        return None
+
+    # Platform setup is outside what this benchmark measures
+    hass.config_entries = SimpleNamespace(async_forward_entry_setups=forward_entry_setups)
+
+    timings = []
+    for entry in entries:
+        entry.unload_callbacks = []
+        start = time.perf_counter()
+        await integration.async_setup_entry(hass, entry)
+        timings.append(time.perf_counter() - start)
+
+    # Let background refreshes finish and flush the persisted observations
+    await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+
+    for entry in entries:
+        for func in entry.unload_callbacks:
+            func()
+    await hass.async_stop(force=True)
+    return timings
+
+
+def report(label, timings):
+    ms = sorted(t * 1000 for t in timings)
+    print(f"\n⏱️  {label} setup ({len(ms)} entries)")
+    print(f"  total : {sum(ms):9.1f} ms")
+    print(f"  median: {statistics.median(ms):9.2f} ms")
+    print(f"  p95   : {ms[int(len(ms) * 0.95) - 1]:9.2f} ms")
+    print(f"  max   : {ms[-1]:9.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark Wunderground Scraper setup time")
+    parser.add_argument("--entries", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.3, help="fake API latency in seconds")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    integration = importlib.import_module(INTEGRATION)
+    import_ms = (time.perf_counter() - start) * 1000
+    coordinator = importlib.import_module(f"{INTEGRATION}.coordinator")
+
+    api = FakeWeatherApi(latency=args.latency).start()
+    coordinator.API_ENDPOINT = api.endpoint
+
+    print(f"🌦️  Fake API: {api.endpoint} ({args.latency * 1000:.0f} ms latency)")
+    print(f"📦 Integration import: {import_ms:.1f} ms "
+          f"(requests loaded: {'requests' in sys.modules})")
+
+    entries = [make_entry(i) for i in range(args.entries)]
+    with tempfile.TemporaryDirectory() as config_dir:
+        report("Cold", await run_pass(config_dir, integration, entries))
+        cold_requests = api.requests
+        report("Warm", await run_pass(config_dir, integration, entries))
+
+    # Warm-pass refreshes are staggered after setup returns and are not awaited
+    print(f"\n📈 API requests during setup: {cold_requests} cold, "
+          f"{api.requests - cold_requests} warm")
+    api.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Fake Weather.com PWS API for benchmarks and offline testing.
+Serves the recorded response from sensor_test_results.json for any station.
+Usage: python debug/fake_api.py [--port 8765] [--latency 0.2] [--status 200]
+"""
+import argparse
+import copy
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_FIXTURE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "sensor_test_results.json"
+)
+
+
+class FakeWeatherApi:
+    """Threaded HTTP server imitating /v2/pws/observations/current."""
+
+    def __init__(self, fixture=DEFAULT_FIXTURE, port=0, latency=0.0, status=200):
+        """Load the recorded response and prepare the server."""
+        with open(fixture) as f:
+            recorded = json.load(f)
+        # Accept both test_sensors.py exports and raw API responses
+        self.response = recorded.get("api_response", recorded)
+        self.latency = latency
+        self.status = status
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        """Return the URL to use as API_ENDPOINT."""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v2/pws/observations/current"
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        """Build the request handler bound to this server."""
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with api._lock:
+                    api.requests += 1
+                if api.latency:
+                    time.sleep(api.latency)
+
+                if api.status != 200:
+                    self.send_response(api.status)
+                    self.end_headers()
+                    return
+
+                query = parse_qs(urlparse(self.path).query)
+                station_id = query.get("stationId", ["KTEST1"])[0]
+
+                body = copy.deepcopy(api.response)
+                for obs in body.get("observations", []):
+                    obs["stationID"] = station_id
+                    obs["epoch"] = int(time.time())
+                payload = json.dumps(body).encode()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--status", type=int, default=200, help="HTTP status to return")
+    args = parser.parse_args()
+
+    api = FakeWeatherApi(args.fixture, args.port, args.latency, args.status).start()
+    print(f"🌦️  Fake Weather.com API listening on {api.endpoint}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"\n📈 Served {api.requests} requests")
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
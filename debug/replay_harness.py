@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Replay recorded Weather.com responses through the coordinator and fuzz the parser.
+Requires Home Assistant (pip install homeassistant). Fuzzing uses hypothesis when
+it is installed and falls back to a seeded random mutator otherwise.
+Usage: python debug/replay_harness.py [FIXTURE ...] [--iterations 2000] [--fuzz 500] [--seed 0]
+                                     [--min-rate 20000] [--min-replay-rate 1000]
+
+Fixtures are JSON files in the format written by test_sensors.py:
+  api_response  - the raw API response to replay
+  sensors       - optional expected sensor values
+  expect_error  - optional name of the UpdateFailed subclass the response must raise
+A fixture with a "sequence" list instead replays each step's observation once,
+in order, from fresh precipitation state, checking each step's sensors:
+  sequence      - [{"observation": {...}, "sensors": {...}}, ...]
+Without arguments, sensor_test_results.json and debug/fixtures/*.json are replayed.
+
+The script exits non-zero on any failure, including parse or coordinator
+throughput (observations per second) below --min-rate / --min-replay-rate.
+The defaults sit well below what a laptop manages so only real slowdowns
+trip them; pass 0 to disable a check.
+"""
+import argparse
+import asyncio
+import copy
+import glob
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+DEBUG_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DEBUG_DIR, ".."))
+
+DEFAULT_FIXTURES = [os.path.join(DEBUG_DIR, "..", "sensor_test_results.json")] + sorted(
+    glob.glob(os.path.join(DEBUG_DIR, "fixtures", "*.json"))
+)
+
+OBS_KEYS = ["epoch", "obsTimeLocal", "humidity", "winddir", "solarRadiation", "uv", "imperial"]
+IMPERIAL_KEYS = [
+    "temp", "heatIndex", "windChill", "dewpt", "windSpeed", "windGust",
+    "pressure", "precipRate", "precipTotal",
+]
+WEIRD_VALUES = [
+    None, 0, 0.0, -1, -999.9, 1e308, "", "abc", "12.5", True, False,
+    [], {}, [1, 2], {"a": 1}, math.nan, math.inf, -math.inf,
+]
+
+
+class Harness:
+    """Feeds payloads through a real coordinator with the HTTP fetch replaced."""
+
+    def __init__(self, hass, coordinator_module):
+        from homeassistant.helpers.update_coordinator import UpdateFailed
+
+        self.UpdateFailed = UpdateFailed
+        self.module = coordinator_module
+        self.payload = None
+        # The only thing replaced is the blocking HTTP call
+        coordinator_module._fetch = lambda station_id: self.payload
+        self.coordinator = coordinator_module.WundergroundDataUpdateCoordinator(hass, "KTEST1")
+        self.failures = []
+
+    async def run(self, payload):
+        """Return the coordinator's data for a payload, or the UpdateFailed it raised."""
+        self.payload = payload
+        try:
+            return await self.coordinator._async_update_data()
+        except self.UpdateFailed as e:
+            return e
+
+    async def check_fuzz(self, payload):
+        """Check the properties every payload must satisfy."""
+        try:
+            result = await self.run(payload)
+        except Exception as e:
+            self.fail("raised an exception other than UpdateFailed", payload, repr(e))
+            return
+        if isinstance(result, self.UpdateFailed):
+            return
+
+        for key, value in result.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                self.fail(f"non-numeric value for {key}", payload, repr(value))
+
+        obs = payload["observations"][0]
+        imperial = obs.get("imperial") if isinstance(obs.get("imperial"), dict) else {}
+        heat_index = imperial.get("heatIndex")
+        if self.module.as_number(heat_index) is not None and result.get("feels_like") != heat_index:
+            self.fail("feels_like does not use heatIndex", payload, repr(result.get("feels_like")))
+
+    def fail(self, message, payload, detail):
+        self.failures.append((message, detail, json.dumps(payload, default=repr)[:300]))
+
+
+def load_fixture(path):
+    with open(path) as f:
+        fixture = json.load(f)
+    if "api_response" not in fixture and "sequence" not in fixture:
+        fixture = {"api_response": fixture}
+    fixture["name"] = os.path.basename(path)
+    return fixture
+
+
+async def replay_sequence(harness, fixture):
+    """Replay a sequence of observations through stateful accounting."""
+    harness.coordinator.precipitation = harness.module.PrecipitationTracker()
+    for step, item in enumerate(fixture["sequence"], 1):
+        payload = {"observations": [item["observation"]]}
+        result = await harness.run(payload)
+        if isinstance(result, harness.UpdateFailed):
+            harness.fail(f"{fixture['name']} step {step}: unexpected UpdateFailed", payload, str(result))
+            return
+        for key, value in (item.get("sensors") or {}).items():
+            if key not in result or float(result[key]) != float(value):
+                harness.fail(
+                    f"{fixture['name']} step {step}: {key}", payload, f"{result.get(key)!r} != {value!r}"
+                )
+    print(f"  ✅ {fixture['name']:<30} {len(fixture['sequence'])} steps")
+
+
+async def replay(harness, fixtures, iterations):
+    """Replay each fixture, checking expectations, and return observations per second."""
+    total = 0
+    elapsed = 0.0
+    for fixture in fixtures:
+        if "sequence" in fixture:
+            await replay_sequence(harness, fixture)
+            continue
+        payload = copy.deepcopy(fixture["api_response"])
+        observations = payload.get("observations") or []
+        base_epoch = observations[0].get("epoch", 0) if observations else 0
+
+        start = time.perf_counter()
+        for i in range(iterations):
+            if observations:
+                # Advance time so epoch-based deduplication sees new observations
+                observations[0]["epoch"] = base_epoch + i * 300
+            result = await harness.run(payload)
+        elapsed += time.perf_counter() - start
+        total += iterations
+
+        expected_error = fixture.get("expect_error")
+        if expected_error:
+            if type(result).__name__ != expected_error:
+                harness.fail(f"{fixture['name']}: expected {expected_error}", payload, repr(result))
+            else:
+                print(f"  ✅ {fixture['name']:<30} {expected_error}")
+            continue
+        if isinstance(result, harness.UpdateFailed):
+            harness.fail(f"{fixture['name']}: unexpected UpdateFailed", payload, str(result))
+            continue
+        for key, value in (fixture.get("sensors") or {}).items():
+            if key not in result or float(result[key]) != float(value):
+                harness.fail(f"{fixture['name']}: {key}", payload, f"{result.get(key)!r} != {value!r}")
+        print(f"  ✅ {fixture['name']:<30} {len(result)} sensors")
+
+    return total / elapsed if elapsed else 0.0
+
+
+def parse_throughput(harness, fixtures, iterations):
+    """Return observations per second for parsing alone, without the executor hop."""
+    observations = [
+        f["api_response"]["observations"][0]
+        for f in fixtures
+        if "api_response" in f and isinstance(f["api_response"].get("observations"), list) and f["api_response"]["observations"]
+    ]
+    if not observations:
+        return 0.0
+    start = time.perf_counter()
+    for i in range(iterations):
+        harness.module.parse_observation(observations[i % len(observations)])
+    return iterations / (time.perf_counter() - start)
+
+
+def mutate(rng, payload):
+    """Apply a few random shape mutations to a copy of a valid payload."""
+    payload = copy.deepcopy(payload)
+    obs = payload["observations"][0]
+    for _ in range(rng.randint(1, 4)):
+        choice = rng.random()
+        if choice < 0.4:
+            obs.setdefault("imperial", {})
+            if isinstance(obs["imperial"], dict):
+                obs["imperial"][rng.choice(IMPERIAL_KEYS)] = rng.choice(WEIRD_VALUES)
+        elif choice < 0.7:
+            obs[rng.choice(OBS_KEYS)] = rng.choice(WEIRD_VALUES)
+        elif choice < 0.85:
+            obs.pop(rng.choice(OBS_KEYS), None)
+        elif choice < 0.95:
+            payload["observations"] = rng.choice([[], None, [None], ["x"], {}, "x", [obs, obs]])
+            return payload
+        else:
+            return rng.choice([[], None, "x", 1, {"observations": 1}])
+    return payload
+
+
+async def fuzz(harness, fixtures, examples, seed):
+    """Fuzz payload shapes, preferring hypothesis when it is installed."""
+    valid = [
+        f["api_response"] for f in fixtures
+        if "api_response" in f and not f.get("expect_error") and f["api_response"].get("observations")
+    ]
+    loop = asyncio.get_running_loop()
+
+    def check(payload):
+        # Called from the hypothesis thread, runs on the event loop
+        asyncio.run_coroutine_threadsafe(harness.check_fuzz(payload), loop).result()
+
+    try:
+        from hypothesis import HealthCheck, given, settings
+        from hypothesis import strategies as st
+    except ImportError:
+        rng = random.Random(seed)
+        for _ in range(examples):
+            payload = mutate(rng, rng.choice(valid))
+            if isinstance(payload, dict) and isinstance(payload.get("observations"), list) \
+                    and payload["observations"] and isinstance(payload["observations"][0], dict):
+                await harness.check_fuzz(payload)
+            else:
+                try:
+                    await harness.run(payload)
+                except Exception as e:
+                    harness.fail("raised an exception other than UpdateFailed", payload, repr(e))
+        return "random mutator"
+
+    json_values = st.recursive(
+        st.none() | st.booleans() | st.integers() | st.floats() | st.text(max_size=5),
+        lambda children: st.lists(children, max_size=3) | st.dictionaries(st.text(max_size=5), children, max_size=3),
+        max_leaves=5,
+    )
+    numbers = st.one_of(st.none(), st.integers(-1000, 1000), st.floats(allow_nan=True), json_values)
+    imperial = st.one_of(json_values, st.dictionaries(st.sampled_from(IMPERIAL_KEYS), numbers))
+    observation = st.fixed_dictionaries(
+        {"imperial": imperial},
+        optional={key: numbers for key in OBS_KEYS if key != "imperial"},
+    )
+    payloads = st.fixed_dictionaries({"observations": st.lists(observation, min_size=1, max_size=2)})
+
+    @settings(max_examples=examples, deadline=None, database=None, derandomize=True,
+              suppress_health_check=list(HealthCheck))
+    @given(payloads)
+    def run(payload):
+        check(payload)
+
+    await loop.run_in_executor(None, run)
+    return "hypothesis"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay and fuzz the parsing pipeline")
+    parser.add_argument("fixtures", nargs="*", default=DEFAULT_FIXTURES)
+    parser.add_argument("--iterations", type=int, default=2000, help="replays per fixture")
+    parser.add_argument("--fuzz", type=int, default=500, help="fuzzed payloads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-rate", type=float, default=20000,
+                        help="minimum parse-only throughput in observations/s (0 disables)")
+    parser.add_argument("--min-replay-rate", type=float, default=1000,
+                        help="minimum coordinator replay throughput in observations/s (0 disables)")
+    args = parser.parse_args()
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.wunderground_scraper import coordinator as coordinator_module
+
+    fixtures = [load_fixture(path) for path in args.fixtures]
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        harness = Harness(hass, coordinator_module)
+
+        print(f"🔁 Replaying {len(fixtures)} fixture(s) x {args.iterations}")
+        replay_rate = await replay(harness, fixtures, args.iterations)
+        parse_rate = parse_throughput(harness, fixtures, args.iterations * len(fixtures))
+
+        print(f"\n🎲 Fuzzing {args.fuzz} payloads")
+        engine = await fuzz(harness, fixtures, args.fuzz, args.seed)
+        await hass.async_stop(force=True)
+
+    print("\n📈 SUMMARY:")
+    print(f"  Coordinator replay : {replay_rate:,.0f} observations/s")
+    print(f"  Parse only         : {parse_rate:,.0f} observations/s")
+    print(f"  Fuzz engine        : {engine}")
+    if parse_rate < args.min_rate:
+        harness.failures.append(
+            ("parse throughput below --min-rate", f"{parse_rate:,.0f} < {args.min_rate:,.0f}", "")
+        )
+    if replay_rate < args.min_replay_rate:
+        harness.failures.append(
+            ("replay throughput below --min-replay-rate",
+             f"{replay_rate:,.0f} < {args.min_replay_rate:,.0f}", "")
+        )
+    print(f"  Failures           : {len(harness.failures)}")
+    for message, detail, payload in harness.failures[:10]:
+        print(f"  ❌ {message}: {detail}" + (f"\n     payload: {payload}" if payload else ""))
+
+    return 1 if harness.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))